@@ -4,6 +4,10 @@ import os
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+# Size of the AES-GCM nonce prepended to the ciphertext, in bytes
+AES_GCM_NONCE_SIZE = 12
 
 def generate_key(length: int = 32) -> bytes:
 	"""
@@ -19,13 +23,24 @@ def generate_key(length: int = 32) -> bytes:
 
 def generate_256_bits_key() -> bytes:
 	"""
-	Generate a random AES-256 symmetric key.
+	Generate a random 256 bits Fernet symmetric key.
+
+	Fernet splits the key into an AES-128-CBC key and an HMAC-SHA256 key.
 
 	Returns:
-	    bytes: The generated AES-256 symmetric key.
+	    bytes: The generated base64-encoded Fernet key.
 	"""
 	return generate_key(32)
 
+def generate_aes_256_gcm_key() -> bytes:
+	"""
+	Generate a random raw AES-256-GCM symmetric key.
+
+	Returns:
+	    bytes: The generated 32 bytes AES-256 key.
+	"""
+	return AESGCM.generate_key(bit_length=256)
+
 def encrypt_file_with_symmetric_key(file_bytes: bytes, key: bytes) -> bytes:
 	"""
     Encrypt file bytes using a symmetric key (Fernet/AES).
@@ -41,6 +56,48 @@ def encrypt_file_with_symmetric_key(file_bytes: bytes, key: bytes) -> bytes:
 	encrypted = f.encrypt(file_bytes)
 	return encrypted
 
+def decrypt_file_with_symmetric_key(encrypted_bytes: bytes, key: bytes) -> bytes:
+	"""
+	Decrypt file bytes using a symmetric key (Fernet/AES).
+
+	Args:
+		encrypted_bytes (bytes): The encrypted file content.
+		key (bytes): The symmetric key (32 bytes for Fernet).
+
+	Returns:
+		bytes: The decrypted file content.
+	"""
+	f = Fernet(key)
+	return f.decrypt(encrypted_bytes)
+
+def encrypt_file_with_aes_256_gcm(file_bytes: bytes, key: bytes) -> bytes:
+	"""
+	Encrypt file bytes using AES-256-GCM.
+
+	Args:
+		file_bytes (bytes): The file content to encrypt.
+		key (bytes): The raw 32 bytes AES-256 key.
+
+	Returns:
+		bytes: The random nonce followed by the ciphertext and its tag.
+	"""
+	nonce = os.urandom(AES_GCM_NONCE_SIZE)
+	return nonce + AESGCM(key).encrypt(nonce, file_bytes, None)
+
+def decrypt_file_with_aes_256_gcm(encrypted_bytes: bytes, key: bytes) -> bytes:
+	"""
+	Decrypt file bytes encrypted with encrypt_file_with_aes_256_gcm.
+
+	Args:
+		encrypted_bytes (bytes): The nonce followed by the ciphertext and its tag.
+		key (bytes): The raw 32 bytes AES-256 key.
+
+	Returns:
+		bytes: The decrypted file content.
+	"""
+	nonce = encrypted_bytes[:AES_GCM_NONCE_SIZE]
+	return AESGCM(key).decrypt(nonce, encrypted_bytes[AES_GCM_NONCE_SIZE:], None)
+
 def encrypt_symmetric_key_with_public_key(symmetric_key: bytes, public_key) -> bytes:
 	"""
 	Encrypt a symmetric key using a public key.
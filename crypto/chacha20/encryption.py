@@ -0,0 +1,43 @@
+import os
+
+from cryptography.hazmat.primitives.ciphers.aead import ChaCha20Poly1305
+
+# Size of the ChaCha20-Poly1305 nonce prepended to the ciphertext, in bytes
+CHACHA20_POLY1305_NONCE_SIZE = 12
+
+def generate_256_bits_key() -> bytes:
+	"""
+	Generate a random ChaCha20-Poly1305 symmetric key.
+
+	Returns:
+	    bytes: The generated 32 bytes ChaCha20 key.
+	"""
+	return ChaCha20Poly1305.generate_key()
+
+def encrypt_file_with_chacha20_poly1305(file_bytes: bytes, key: bytes) -> bytes:
+	"""
+	Encrypt file bytes using ChaCha20-Poly1305.
+
+	Args:
+		file_bytes (bytes): The file content to encrypt.
+		key (bytes): The raw 32 bytes ChaCha20 key.
+
+	Returns:
+		bytes: The random nonce followed by the ciphertext and its tag.
+	"""
+	nonce = os.urandom(CHACHA20_POLY1305_NONCE_SIZE)
+	return nonce + ChaCha20Poly1305(key).encrypt(nonce, file_bytes, None)
+
+def decrypt_file_with_chacha20_poly1305(encrypted_bytes: bytes, key: bytes) -> bytes:
+	"""
+	Decrypt file bytes encrypted with encrypt_file_with_chacha20_poly1305.
+
+	Args:
+		encrypted_bytes (bytes): The nonce followed by the ciphertext and its tag.
+		key (bytes): The raw 32 bytes ChaCha20 key.
+
+	Returns:
+		bytes: The decrypted file content.
+	"""
+	nonce = encrypted_bytes[:CHACHA20_POLY1305_NONCE_SIZE]
+	return ChaCha20Poly1305(key).decrypt(nonce, encrypted_bytes[CHACHA20_POLY1305_NONCE_SIZE:], None)
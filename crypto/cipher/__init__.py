@@ -0,0 +1,230 @@
+from concurrent import futures
+import multiprocessing
+import os
+import threading
+import time
+from typing import Callable, Iterable, NamedTuple
+
+from dotenv import load_dotenv
+
+from crypto.aes.encryption import (
+	decrypt_file_with_aes_256_gcm,
+	decrypt_file_with_symmetric_key,
+	encrypt_file_with_aes_256_gcm,
+	encrypt_file_with_symmetric_key,
+	generate_256_bits_key,
+	generate_aes_256_gcm_key,
+)
+from crypto.chacha20 import encryption as chacha20_encryption
+from crypto.cipher import segmented
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
+
+# Load environment variables from a .env file
+load_dotenv()
+
+class CipherSuite(NamedTuple):
+	"""
+	Symmetric cipher used to encrypt the file content.
+
+	The ID is sent to the Decrypter alongside the wrapped key, so it can
+	dispatch on it. Segmented suites also yield their output in ordered
+	pieces through encrypt_segments.
+	"""
+	id: str
+	generate_key: Callable[[], bytes]
+	encrypt: Callable[[bytes, bytes], bytes]
+	decrypt: Callable[[bytes, bytes], bytes]
+	aead: bool
+	encrypt_segments: Callable[[bytes, bytes], Iterable[bytes]] | None = None
+
+# Cipher IDs sent to the Decrypter
+FERNET_CIPHER_ID = "fernet"
+AES_256_GCM_CIPHER_ID = "aes-256-gcm"
+CHACHA20_POLY1305_CIPHER_ID = "chacha20-poly1305"
+AES_256_GCM_SEGMENTED_CIPHER_ID = "aes-256-gcm-segmented"
+CHACHA20_POLY1305_SEGMENTED_CIPHER_ID = "chacha20-poly1305-segmented"
+
+# Pseudo cipher ID that selects the fastest AEAD on this host at startup
+AUTO_CIPHER_ID = "auto"
+
+# Get the segmented encryption configuration from environment variables. A
+# threshold of 0 disables it, which is the default since older Decrypter
+# services do not know the segmented cipher IDs
+SEGMENT_SIZE = int(os.getenv("ENCRYPTER_SEGMENT_SIZE", 1024 * 1024))
+SEGMENT_THRESHOLD_BYTES = int(os.getenv("ENCRYPTER_SEGMENT_THRESHOLD_BYTES", 0))
+SEGMENT_WORKERS = int(os.getenv("ENCRYPTER_SEGMENT_WORKERS", os.cpu_count() or 1))
+
+# Segments of a single file submitted to the worker pool at once, so that a
+# large file cannot starve the others sharing the pool
+SEGMENT_WINDOW = 2 * SEGMENT_WORKERS
+
+# Worker processes shared by every segmented encryption. The AEAD calls of
+# cryptography hold the GIL, so threads would encrypt one segment at a time.
+# The workers are spawned rather than forked, since forking a process that
+# runs gRPC threads is unsafe
+_segment_executor = None
+_segment_executor_lock = threading.Lock()
+
+def get_segment_executor() -> futures.ProcessPoolExecutor | None:
+	"""
+	Get the worker pool for segmented encryption, creating it on first use.
+
+	Returns:
+		futures.ProcessPoolExecutor | None: The worker pool, or None with a
+		single worker, as the segments are then encrypted on the caller's
+		thread without copying them to another process.
+	"""
+	global _segment_executor
+	if SEGMENT_WORKERS <= 1:
+		return None
+	with _segment_executor_lock:
+		if _segment_executor is None:
+			_segment_executor = futures.ProcessPoolExecutor(
+				max_workers=SEGMENT_WORKERS,
+				mp_context=multiprocessing.get_context("spawn"),
+			)
+	return _segment_executor
+
+def segmented_cipher_suite(
+	cipher_id: str,
+	aead_class,
+	generate_key: Callable[[], bytes],
+) -> CipherSuite:
+	"""
+	Build a segmented cipher suite for an AEAD class.
+
+	Args:
+		cipher_id (str): The cipher ID.
+		aead_class: The AEAD class, e.g. AESGCM or ChaCha20Poly1305.
+		generate_key (Callable[[], bytes]): The key generator of the AEAD.
+
+	Returns:
+		CipherSuite: The segmented cipher suite.
+	"""
+	def encrypt_segments(file_bytes: bytes, key: bytes) -> Iterable[bytes]:
+		return segmented.encrypt_segments(
+			aead_class,
+			file_bytes,
+			key,
+			SEGMENT_SIZE,
+			get_segment_executor(),
+			SEGMENT_WINDOW,
+		)
+
+	def decrypt(encrypted_bytes: bytes, key: bytes) -> bytes:
+		return segmented.decrypt_segments(
+			aead_class,
+			encrypted_bytes,
+			key,
+			get_segment_executor(),
+			SEGMENT_WINDOW,
+		)
+
+	return CipherSuite(
+		id=cipher_id,
+		generate_key=generate_key,
+		encrypt=lambda file_bytes, key: b"".join(encrypt_segments(file_bytes, key)),
+		decrypt=decrypt,
+		aead=True,
+		encrypt_segments=encrypt_segments,
+	)
+
+CIPHER_SUITES = {
+	suite.id: suite for suite in (
+		CipherSuite(
+			id=FERNET_CIPHER_ID,
+			generate_key=generate_256_bits_key,
+			encrypt=encrypt_file_with_symmetric_key,
+			decrypt=decrypt_file_with_symmetric_key,
+			aead=False,
+		),
+		CipherSuite(
+			id=AES_256_GCM_CIPHER_ID,
+			generate_key=generate_aes_256_gcm_key,
+			encrypt=encrypt_file_with_aes_256_gcm,
+			decrypt=decrypt_file_with_aes_256_gcm,
+			aead=True,
+		),
+		CipherSuite(
+			id=CHACHA20_POLY1305_CIPHER_ID,
+			generate_key=chacha20_encryption.generate_256_bits_key,
+			encrypt=chacha20_encryption.encrypt_file_with_chacha20_poly1305,
+			decrypt=chacha20_encryption.decrypt_file_with_chacha20_poly1305,
+			aead=True,
+		),
+		segmented_cipher_suite(
+			AES_256_GCM_SEGMENTED_CIPHER_ID,
+			AESGCM,
+			generate_aes_256_gcm_key,
+		),
+		segmented_cipher_suite(
+			CHACHA20_POLY1305_SEGMENTED_CIPHER_ID,
+			ChaCha20Poly1305,
+			chacha20_encryption.generate_256_bits_key,
+		),
+	)
+}
+
+# Segmented variant of each AEAD, used for files over the segment threshold.
+# They share the key format, so keys generated for one work for the other
+SEGMENTED_CIPHER_IDS = {
+	AES_256_GCM_CIPHER_ID: AES_256_GCM_SEGMENTED_CIPHER_ID,
+	CHACHA20_POLY1305_CIPHER_ID: CHACHA20_POLY1305_SEGMENTED_CIPHER_ID,
+}
+
+# Get the cipher configuration from environment variables, Fernet is kept
+# as default since it is the only cipher known by older Decrypter services
+ENCRYPTER_CIPHER = os.getenv("ENCRYPTER_CIPHER", FERNET_CIPHER_ID)
+
+# Get the data key pool configuration from environment variables, a depth
+# of 0 disables the pool
+KEY_POOL_DEPTH = int(os.getenv("ENCRYPTER_KEY_POOL_DEPTH", 64))
+KEY_POOL_STATS_INTERVAL = float(os.getenv("ENCRYPTER_KEY_POOL_STATS_INTERVAL", 60))
+
+def get_cipher_suite(cipher_id: str) -> CipherSuite:
+	"""
+	Get a registered cipher suite by its ID.
+
+	Args:
+		cipher_id (str): The cipher ID.
+
+	Returns:
+		CipherSuite: The cipher suite.
+
+	Raises:
+		ValueError: If the cipher ID is not registered.
+	"""
+	try:
+		return CIPHER_SUITES[cipher_id]
+	except KeyError:
+		raise ValueError(f"Unknown cipher: {cipher_id}") from None
+
+def calibrate_cipher_suite(sample_size: int = 1024 * 1024, rounds: int = 5) -> tuple:
+	"""
+	Pick the fastest AEAD cipher suite on this host.
+
+	Each AEAD encrypts the same random sample several times and the best
+	round is kept, e.g. ChaCha20-Poly1305 wins on CPUs without AES-NI.
+
+	Args:
+		sample_size (int): Size of the sample to encrypt in bytes. Default is 1 MiB.
+		rounds (int): Number of timed rounds per cipher. Default is 5.
+
+	Returns:
+		tuple: The fastest cipher suite and the best round time of each cipher in seconds.
+	"""
+	sample = os.urandom(sample_size)
+	timings = {}
+	for suite in CIPHER_SUITES.values():
+		if not suite.aead or suite.encrypt_segments is not None:
+			continue
+		key = suite.generate_key()
+		suite.encrypt(sample, key)
+		best = float("inf")
+		for _ in range(rounds):
+			start = time.perf_counter()
+			suite.encrypt(sample, key)
+			best = min(best, time.perf_counter() - start)
+		timings[suite.id] = best
+	fastest = min(timings, key=timings.get)
+	return CIPHER_SUITES[fastest], timings
@@ -0,0 +1,146 @@
+from collections import deque
+import threading
+import time
+
+from crypto.aes.encryption import encrypt_symmetric_key_with_public_key
+from crypto.cipher import CipherSuite
+
+class DataKeyPool:
+	"""
+	Bounded pool of pre-generated data keys, each already wrapped with the
+	public key, kept filled by a background thread.
+
+	Popping a pair is O(1), so requests do not pay for the RSA-OAEP wrapping
+	unless the pool runs dry. Rotating the public key flushes the pool.
+	"""
+
+	def __init__(self, cipher_suite: CipherSuite, public_key, depth: int = 64):
+		"""
+		Initialize the pool. The refill thread is started by start().
+
+		Args:
+			cipher_suite (CipherSuite): The cipher suite to generate data keys for.
+			public_key: The public key object to wrap the data keys with.
+			depth (int): Maximum number of pairs kept in the pool. Default is 64.
+		"""
+		self.cipher_suite = cipher_suite
+		self.depth = depth
+		self._public_key = public_key
+		self._generation = 0
+		self._pairs = deque()
+		self._condition = threading.Condition()
+		self._stopped = False
+		self._thread = threading.Thread(target=self._refill, daemon=True)
+		self._started_at = None
+
+		# Counters exposed by stats()
+		self._refilled = 0
+		self._popped = 0
+		self._underflows = 0
+		self._flushed = 0
+
+	def start(self):
+		"""
+		Start the background refill thread.
+		"""
+		self._started_at = time.monotonic()
+		self._thread.start()
+
+	def stop(self):
+		"""
+		Stop the background refill thread and wait for it to finish.
+		"""
+		with self._condition:
+			self._stopped = True
+			self._condition.notify_all()
+		self._thread.join()
+
+	def generate(self, public_key=None) -> tuple:
+		"""
+		Generate a data key and wrap it with the public key.
+
+		Args:
+			public_key (optional): The public key object. Defaults to the pool's current key.
+
+		Returns:
+			tuple: The data key and the wrapped data key.
+		"""
+		symmetric_key = self.cipher_suite.generate_key()
+		encrypted_symmetric_key = encrypt_symmetric_key_with_public_key(
+			symmetric_key=symmetric_key,
+			public_key=public_key or self._public_key,
+		)
+		return symmetric_key, encrypted_symmetric_key
+
+	def pop(self) -> tuple:
+		"""
+		Take a pair from the pool, generating it on the caller's thread if the
+		pool is empty.
+
+		Returns:
+			tuple: The data key and the wrapped data key.
+		"""
+		with self._condition:
+			self._popped += 1
+			if self._pairs:
+				pair = self._pairs.popleft()
+				self._condition.notify_all()
+				return pair
+			self._underflows += 1
+			public_key = self._public_key
+		return self.generate(public_key)
+
+	def rotate(self, public_key):
+		"""
+		Switch to a new public key, flushing the pairs wrapped with the old one.
+
+		Args:
+			public_key: The new public key object.
+		"""
+		with self._condition:
+			self._public_key = public_key
+			self._generation += 1
+			self._flushed += len(self._pairs)
+			self._pairs.clear()
+			self._condition.notify_all()
+
+	def stats(self) -> dict:
+		"""
+		Get the pool counters.
+
+		Returns:
+			dict: The pool depth and size, the refill and pop rates in pairs
+			per wall-clock second since the pool was started, and the
+			refill, pop, underflow and flush counts.
+		"""
+		with self._condition:
+			elapsed = time.monotonic() - self._started_at if self._started_at is not None else 0.0
+			return {
+				'depth': self.depth,
+				'size': len(self._pairs),
+				'refilled': self._refilled,
+				'refill_per_s': self._refilled / elapsed if elapsed else 0.0,
+				'popped': self._popped,
+				'pop_per_s': self._popped / elapsed if elapsed else 0.0,
+				'underflows': self._underflows,
+				'flushed': self._flushed,
+			}
+
+	def _refill(self):
+		while True:
+			# Wait until the pool has room
+			with self._condition:
+				self._condition.wait_for(lambda: self._stopped or len(self._pairs) < self.depth)
+				if self._stopped:
+					return
+				public_key = self._public_key
+				generation = self._generation
+
+			# Generate outside the lock, so pops are never blocked by RSA
+			pair = self.generate(public_key)
+
+			# Drop the pair if the key was rotated while it was generated
+			with self._condition:
+				if generation == self._generation and len(self._pairs) < self.depth:
+					self._pairs.append(pair)
+					self._refilled += 1
@@ -0,0 +1,172 @@
+from collections import deque
+import os
+import struct
+
+from cryptography.hazmat.primitives.ciphers import aead
+
+# Layout of the segmented AEAD output:
+#   header:  segment size (uint32, big-endian) || random nonce prefix (7 bytes)
+#   body:    every segment encrypted independently, each followed by its tag
+# The nonce of each segment is the prefix, the segment index (uint32,
+# big-endian) and a last-segment flag byte, so segments cannot be reordered,
+# dropped or truncated without failing authentication.
+NONCE_PREFIX_SIZE = 7
+HEADER_SIZE = 4 + NONCE_PREFIX_SIZE
+TAG_SIZE = 16
+
+def segment_nonce(nonce_prefix: bytes, index: int, last: bool) -> bytes:
+	"""
+	Build the nonce of a segment.
+
+	Args:
+		nonce_prefix (bytes): The random nonce prefix of the file.
+		index (int): The index of the segment.
+		last (bool): Whether it is the last segment.
+
+	Returns:
+		bytes: The 12 bytes nonce.
+	"""
+	return nonce_prefix + struct.pack('>IB', index, last)
+
+# The AEAD classes cannot be pickled, so the worker processes get them by
+# their name in cryptography.hazmat.primitives.ciphers.aead
+def _encrypt_segment(aead_name: str, key: bytes, nonce: bytes, segment: bytes) -> bytes:
+	return getattr(aead, aead_name)(key).encrypt(nonce, segment, None)
+
+def _decrypt_segment(aead_name: str, key: bytes, nonce: bytes, segment: bytes) -> bytes:
+	return getattr(aead, aead_name)(key).decrypt(nonce, segment, None)
+
+def _map_bounded(executor, function, arguments, window: int):
+	"""
+	Map a function over argument tuples on an executor, keeping at most
+	window calls submitted at once and yielding the results in order.
+
+	Args:
+		executor: The executor to run the calls on.
+		function: The function to call, it must be picklable for a process pool.
+		arguments (Iterator[tuple]): The arguments of each call, consumed as the calls are submitted.
+		window (int): Maximum number of calls submitted at once.
+
+	Yields:
+		The result of each call, in order.
+	"""
+	pending = deque()
+	try:
+		for call_arguments in arguments:
+			if len(pending) >= max(1, window):
+				yield pending.popleft().result()
+			pending.append(executor.submit(function, *call_arguments))
+		while pending:
+			yield pending.popleft().result()
+	finally:
+		# Cancel the calls not started yet if the caller stopped early
+		for future in pending:
+			future.cancel()
+
+def encrypt_segments(
+	aead_class,
+	file_bytes: bytes,
+	key: bytes,
+	segment_size: int,
+	executor=None,
+	window: int = 1,
+):
+	"""
+	Encrypt file bytes as independently-nonced AEAD segments.
+
+	The segments are encrypted concurrently on the executor and yielded in
+	order, so they can be forwarded while the later ones are still being
+	encrypted. At most window segments of a file are in flight at once, so
+	a large file does not queue ahead of every other file sharing the
+	executor, and the pending ones are cancelled if the caller stops early.
+
+	Args:
+		aead_class: The AEAD class, e.g. AESGCM or ChaCha20Poly1305.
+		file_bytes (bytes): The file content to encrypt.
+		key (bytes): The raw 32 bytes key.
+		segment_size (int): The size of each plaintext segment in bytes.
+		executor (optional): The executor to encrypt the segments on. Defaults to the caller's thread.
+		window (int): Maximum number of segments submitted to the executor at once. Default is 1.
+
+	Yields:
+		bytes: The header, then each encrypted segment with its tag.
+	"""
+	nonce_prefix = os.urandom(NONCE_PREFIX_SIZE)
+	file_view = memoryview(file_bytes)
+	segments_count = max(1, -(-len(file_view) // segment_size))
+
+	yield struct.pack('>I', segment_size) + nonce_prefix
+	if executor is None:
+		cipher = aead_class(key)
+		for index in range(segments_count):
+			segment = file_view[index * segment_size:(index + 1) * segment_size]
+			yield cipher.encrypt(segment_nonce(nonce_prefix, index, index == segments_count - 1), segment, None)
+		return
+
+	# The segments are copied out of the file as they are submitted, since
+	# they are pickled to the worker processes
+	arguments = (
+		(
+			aead_class.__name__,
+			key,
+			segment_nonce(nonce_prefix, index, index == segments_count - 1),
+			bytes(file_view[index * segment_size:(index + 1) * segment_size]),
+		)
+		for index in range(segments_count)
+	)
+	yield from _map_bounded(executor, _encrypt_segment, arguments, window)
+
+def decrypt_segments(
+	aead_class,
+	encrypted_bytes: bytes,
+	key: bytes,
+	executor=None,
+	window: int = 1,
+) -> bytes:
+	"""
+	Decrypt file bytes encrypted with encrypt_segments.
+
+	Args:
+		aead_class: The AEAD class, e.g. AESGCM or ChaCha20Poly1305.
+		encrypted_bytes (bytes): The header followed by the encrypted segments.
+		key (bytes): The raw 32 bytes key.
+		executor (optional): The executor to decrypt the segments on. Defaults to the caller's thread.
+		window (int): Maximum number of segments submitted to the executor at once. Default is 1.
+
+	Returns:
+		bytes: The decrypted file content.
+
+	Raises:
+		ValueError: If the header is truncated.
+		cryptography.exceptions.InvalidTag: If any segment fails authentication.
+	"""
+	if len(encrypted_bytes) < HEADER_SIZE + TAG_SIZE:
+		raise ValueError("Segmented ciphertext is truncated")
+	encrypted_view = memoryview(encrypted_bytes)
+	segment_size = struct.unpack('>I', encrypted_view[:4])[0]
+	nonce_prefix = bytes(encrypted_view[4:HEADER_SIZE])
+	body = encrypted_view[HEADER_SIZE:]
+	encrypted_segment_size = segment_size + TAG_SIZE
+	segments_count = max(1, -(-len(body) // encrypted_segment_size))
+
+	if executor is None:
+		cipher = aead_class(key)
+		return b''.join(
+			cipher.decrypt(
+				segment_nonce(nonce_prefix, index, index == segments_count - 1),
+				body[index * encrypted_segment_size:(index + 1) * encrypted_segment_size],
+				None,
+			)
+			for index in range(segments_count)
+		)
+
+	arguments = (
+		(
+			aead_class.__name__,
+			key,
+			segment_nonce(nonce_prefix, index, index == segments_count - 1),
+			bytes(body[index * encrypted_segment_size:(index + 1) * encrypted_segment_size]),
+		)
+		for index in range(segments_count)
+	)
+	return b''.join(_map_bounded(executor, _decrypt_segment, arguments, window))
@@ -12,4 +12,5 @@ load_dotenv()
 
 # Load tender's public key from PEM file
 TENDER_PUBLIC_KEY_FILENAME = "tender_public_key.pem"
-TENDER_PUBLIC_KEY = load_public_key_from_file(os.path.join(BASE_DIR, TENDER_PUBLIC_KEY_FILENAME))
\ No newline at end of file
+TENDER_PUBLIC_KEY_PATH = os.path.join(BASE_DIR, TENDER_PUBLIC_KEY_FILENAME)
+TENDER_PUBLIC_KEY = load_public_key_from_file(TENDER_PUBLIC_KEY_PATH)
\ No newline at end of file
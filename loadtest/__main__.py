@@ -0,0 +1,256 @@
+from argparse import ArgumentParser
+import base64
+import json
+import logging
+import os
+import threading
+import time
+
+from loadtest.decrypter import (
+	add_emulator_arguments,
+	create_server as create_decrypter_server,
+	create_servicer_from_arguments,
+)
+from loadtest.generator import (
+	MODES,
+	STREAM_MODE,
+	default_certificate_b64,
+	parse_size,
+	parse_size_distribution,
+	run_load,
+)
+from loadtest.metrics import (
+	RequestRecorder,
+	RssSampler,
+	read_rss_bytes,
+)
+
+# Configure logging
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger('loadtest')
+logger.setLevel(logging.INFO)
+
+def start_in_process_services(
+	decrypter_servicer,
+	server_workers: int,
+	cipher_id: str,
+	key_pool_depth: int | None,
+):
+	"""
+	Start the Decrypter emulator and the Encrypter service in this process.
+
+	The Decrypter address is exported through the environment before the
+	Encrypter is imported, since it is read once at import time.
+
+	Args:
+		decrypter_servicer (DecrypterServicer): The Decrypter emulator.
+		server_workers (int): Number of worker threads for each server.
+		cipher_id (str): The cipher the Encrypter encrypts files with, or 'auto'.
+		key_pool_depth (int | None): Depth of the Encrypter's data key pool, None for its default.
+
+	Returns:
+		tuple: The Encrypter target address, both servicers and both servers.
+	"""
+	decrypter_server, decrypter_port = create_decrypter_server(
+		decrypter_servicer,
+		max_workers=server_workers,
+	)
+	decrypter_server.start()
+	os.environ['DECRYPTER_GRPC_HOST'] = 'localhost'
+	os.environ['DECRYPTER_GRPC_PORT'] = str(decrypter_port)
+
+	# Import the Encrypter only after its Decrypter address is configured
+	from main import (
+		KEY_POOL_DEPTH,
+		create_server as create_encrypter_server,
+		resolve_cipher_suite,
+	)
+
+	encrypter_server, encrypter_port, encrypter_servicer = create_encrypter_server(
+		'localhost',
+		0,
+		max_workers=server_workers,
+		cipher_suite=resolve_cipher_suite(cipher_id),
+		key_pool_depth=KEY_POOL_DEPTH if key_pool_depth is None else key_pool_depth,
+	)
+	encrypter_server.start()
+	return (
+		f'localhost:{encrypter_port}',
+		(encrypter_servicer, decrypter_servicer),
+		(encrypter_server, decrypter_server),
+	)
+
+def main():
+	parser = ArgumentParser(
+		prog='python -m loadtest',
+		description='Load generator and soak test for the Encrypter service',
+	)
+	parser.add_argument(
+		'--target',
+		type=str,
+		help='Encrypter address as host:port. If omitted, the Encrypter and a '
+		     'Decrypter emulator are started in this process',
+	)
+	parser.add_argument('--concurrency', type=int, default=8, help='Concurrent uploads')
+	parser.add_argument('--duration', type=float, default=30.0, help='Duration in seconds')
+	parser.add_argument(
+		'--sizes',
+		type=str,
+		default='4KiB:70,64KiB:25,4MiB:5',
+		help='Weighted file size distribution as size[:weight],...',
+	)
+	parser.add_argument('--mode', type=str, default=STREAM_MODE, choices=MODES, help='Upload RPC to drive')
+	parser.add_argument('--chunk-size', type=str, default='64KiB', help='Size of each streamed chunk')
+	parser.add_argument('--certificate', type=str, help='Path to the certificate sent as metadata')
+	parser.add_argument(
+		'--cipher',
+		type=str,
+		default='fernet',
+		help='Cipher of the in-process Encrypter, or auto to pick the fastest AEAD',
+	)
+	parser.add_argument(
+		'--key-pool-depth',
+		type=int,
+		help='Depth of the in-process Encrypter data key pool, 0 disables it',
+	)
+	parser.add_argument('--server-workers', type=int, help='Worker threads of the in-process servers')
+	parser.add_argument('--report-interval', type=float, default=5.0, help='Seconds between progress reports')
+	parser.add_argument(
+		'--pid',
+		type=int,
+		help='PID of the Encrypter to sample the RSS of when using --target. '
+		     'Without it, only the load generator RSS is sampled',
+	)
+	parser.add_argument('--rss-interval', type=float, default=1.0, help='Seconds between RSS samples')
+	add_emulator_arguments(parser, 'decrypter-')
+	parser.add_argument('--seed', type=int, help='Seed for the file size choices')
+	parser.add_argument('--json', type=str, help='Write the final report as JSON to this path')
+	args = parser.parse_args()
+
+	distribution = parse_size_distribution(args.sizes)
+	chunk_size = parse_size(args.chunk_size)
+	if args.certificate:
+		with open(args.certificate, 'rb') as f:
+			certificate_b64 = base64.b64encode(f.read()).decode()
+	else:
+		certificate_b64 = default_certificate_b64()
+
+	# Start the services under test
+	encrypter_servicer = decrypter_servicer = None
+	servers = ()
+	target = args.target
+	if not target:
+		try:
+			decrypter_servicer = create_servicer_from_arguments(args, 'decrypter-', seed=args.seed)
+		except ValueError as e:
+			parser.error(str(e))
+		target, (encrypter_servicer, decrypter_servicer), servers = start_in_process_services(
+			decrypter_servicer,
+			args.server_workers or max(10, args.concurrency),
+			args.cipher,
+			args.key_pool_depth,
+		)
+	# Sample the RSS of the Encrypter under test when it can be reached
+	if args.target and args.pid:
+		rss_pid, rss_source = args.pid, f'Encrypter (pid {args.pid})'
+	elif args.target:
+		rss_pid, rss_source = None, 'load generator only (pass --pid to sample the Encrypter)'
+	else:
+		rss_pid, rss_source = None, 'load generator, Encrypter and Decrypter emulator (in-process)'
+	logger.info(
+		f'Driving {target} with {args.concurrency} {args.mode} uploads for {args.duration}s, '
+		f'sizes {args.sizes}, chunk size {chunk_size} bytes'
+	)
+
+	recorder = RequestRecorder()
+	sampler = RssSampler(args.rss_interval, rss_pid)
+	sampler.start()
+	load = threading.Thread(
+		target=run_load,
+		args=(
+			target,
+			args.concurrency,
+			args.duration,
+			distribution,
+			chunk_size,
+			certificate_b64,
+			recorder,
+			args.seed,
+			args.mode,
+		),
+		daemon=True,
+	)
+	start = time.perf_counter()
+	load.start()
+
+	# Report progress until the load finishes
+	last_time, last_requests, last_bytes, last_errors = start, 0, 0, 0
+	while True:
+		load.join(args.report_interval)
+		now = time.perf_counter()
+		requests, total_bytes, errors = recorder.snapshot()
+		interval = now - last_time
+		rss = read_rss_bytes(rss_pid)
+		logger.info(
+			f'[{now - start:7.1f}s] {(requests - last_requests) / interval:8.1f} req/s '
+			f'{(total_bytes - last_bytes) / interval / (1024 * 1024):8.2f} MiB/s '
+			f'{errors - last_errors} errors '
+			f'RSS {rss / (1024 * 1024) if rss is not None else float("nan"):.1f} MiB'
+		)
+		last_time, last_requests, last_bytes, last_errors = now, requests, total_bytes, errors
+		if not load.is_alive():
+			break
+
+	elapsed = time.perf_counter() - start
+	sampler.stop()
+	for server in servers:
+		server.stop(None)
+
+	# Final report
+	report = recorder.summary(elapsed)
+	report.update(sampler.summary())
+	report['rss_source'] = rss_source
+	if decrypter_servicer is not None:
+		report['decrypter_received_files'] = decrypter_servicer.received_files
+		report['decrypter_received_bytes'] = decrypter_servicer.received_bytes
+		report['decrypter_decrypted_files'] = decrypter_servicer.decrypted_files
+		report['decrypter_verified_files'] = decrypter_servicer.verified_files
+		report['decrypter_injected_errors'] = decrypter_servicer.injected_errors
+		report['decrypter_injected_disconnects'] = decrypter_servicer.injected_disconnects
+	if encrypter_servicer is not None and encrypter_servicer.key_pool is not None:
+		report['key_pool'] = encrypter_servicer.key_pool.stats()
+	logger.info(
+		f'Requests: {report["requests"]} ({report["ok_requests"]} ok), '
+		f'{report["requests_per_s"]:.1f} req/s, {report["mib_per_s"]:.2f} MiB/s'
+	)
+	logger.info(
+		f'Latency: p50 {report["p50_ms"]:.2f} ms, p99 {report["p99_ms"]:.2f} ms, '
+		f'p999 {report["p999_ms"]:.2f} ms, max {report["max_ms"]:.2f} ms'
+	)
+	logger.info(f'Error rate: {report["error_rate"]:.4%} {report["errors"]}')
+	if 'rss_end_mib' in report:
+		logger.info(
+			f'RSS of {rss_source}: start {report["rss_start_mib"]:.1f} MiB, end {report["rss_end_mib"]:.1f} MiB, '
+			f'peak {report["rss_peak_mib"]:.1f} MiB, steady growth {report["rss_steady_growth_mib"]:+.1f} MiB'
+		)
+	if decrypter_servicer is not None:
+		logger.info(
+			f'Decrypter: {report["decrypter_received_files"]} files received, '
+			f'{report["decrypter_decrypted_files"]} decrypted, '
+			f'{report["decrypter_verified_files"]} verified, '
+			f'{report["decrypter_injected_errors"]} injected errors, '
+			f'{report["decrypter_injected_disconnects"]} injected disconnects'
+		)
+	if 'key_pool' in report:
+		key_pool = report['key_pool']
+		logger.info(
+			f'Key pool: depth {key_pool["depth"]}, refill {key_pool["refill_per_s"]:.1f} keys/s, '
+			f'pop {key_pool["pop_per_s"]:.1f} keys/s, '
+			f'{key_pool["underflows"]}/{key_pool["popped"]} underflows'
+		)
+	if args.json:
+		with open(args.json, 'w') as f:
+			json.dump(report, f, indent=2)
+
+if __name__ == '__main__':
+	main()
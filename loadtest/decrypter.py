@@ -0,0 +1,344 @@
+from argparse import ArgumentParser
+from concurrent import futures
+import hashlib
+import logging
+import random
+import threading
+import time
+
+import grpc
+
+from cryptography.exceptions import InvalidSignature, InvalidTag
+from cryptography.fernet import InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding
+from google.protobuf.empty_pb2 import Empty
+from ralvarezdev import decrypter_pb2
+from ralvarezdev import decrypter_pb2_grpc
+from crypto import (
+	load_private_key_from_file,
+	load_public_key_from_file,
+)
+from crypto.cipher import (
+	FERNET_CIPHER_ID,
+	get_cipher_suite,
+)
+
+logger = logging.getLogger(__name__)
+
+class Link:
+	"""
+	Shared link with a throughput cap, used to shape the bandwidth of every
+	stream received by the emulator.
+	"""
+
+	def __init__(self, bytes_per_second: float):
+		"""
+		Initialize the link.
+
+		Args:
+			bytes_per_second (float): The throughput cap in bytes per second.
+		"""
+		self.bytes_per_second = bytes_per_second
+		self._lock = threading.Lock()
+		self._free_at = time.monotonic()
+
+	def transfer(self, size: int):
+		"""
+		Block for as long as sending the bytes takes on the link. Concurrent
+		transfers queue behind each other, as they would on a real link.
+
+		Args:
+			size (int): Number of bytes transferred.
+		"""
+		with self._lock:
+			now = time.monotonic()
+			start = max(now, self._free_at)
+			self._free_at = start + size / self.bytes_per_second
+			delay = self._free_at - now
+		time.sleep(delay)
+
+class DecrypterServicer(decrypter_pb2_grpc.DecrypterServicer):
+	"""
+	Local emulator of the Decrypter service.
+
+	Without keys it drains every forwarded stream and only keeps counters,
+	so it can be used as a sink for the Encrypter under load without growing
+	in memory. With the tender's private key it also unwraps the data key and
+	decrypts the file, and with the company's public key too it verifies the
+	signature of the file.
+	Latency, a throughput cap, errors and mid-stream disconnects can be
+	injected to exercise the Encrypter's forward path.
+	"""
+
+	def __init__(
+		self,
+		tender_private_key=None,
+		company_public_key=None,
+		latency: float = 0.0,
+		jitter: float = 0.0,
+		bytes_per_second: float = 0.0,
+		error_rate: float = 0.0,
+		disconnect_rate: float = 0.0,
+		disconnect_after_bytes: int = 1024 * 1024,
+		retain_files: bool = False,
+		seed: int | None = None,
+	):
+		"""
+		Initialize the emulator.
+
+		Args:
+			tender_private_key (optional): The private key to unwrap the data keys with. Defaults to no verification.
+			company_public_key (optional): The public key to verify the signatures with. Defaults to no verification.
+			latency (float): Seconds added before answering each call. Default is 0.
+			jitter (float): Maximum random seconds added to the latency. Default is 0.
+			bytes_per_second (float): Throughput cap shared by all streams, 0 for none. Default is 0.
+			error_rate (float): Probability of failing a call with UNAVAILABLE. Default is 0.
+			disconnect_rate (float): Probability of aborting a stream mid-way. Default is 0.
+			disconnect_after_bytes (int): Bytes that must pass through the link before a
+				disconnect, which only fires if the stream goes on after them. Default is 1 MiB.
+			retain_files (bool): Keep the decrypted files for ListActiveFiles and DecryptFile. Default is False.
+			seed (int | None): Seed for the injected faults. Default is None.
+		"""
+		self.tender_private_key = tender_private_key
+		self.company_public_key = company_public_key
+		self.latency = latency
+		self.jitter = jitter
+		self.link = Link(bytes_per_second) if bytes_per_second > 0 else None
+		self.error_rate = error_rate
+		self.disconnect_rate = disconnect_rate
+		self.disconnect_after_bytes = disconnect_after_bytes
+		self.retain_files = retain_files
+		self._random = random.Random(seed)
+		self._lock = threading.Lock()
+		self._files = {}
+
+		# Counters
+		self.received_files = 0
+		self.received_bytes = 0
+		self.decrypted_files = 0
+		self.verified_files = 0
+		self.injected_errors = 0
+		self.injected_disconnects = 0
+
+	def _roll(self, rate: float) -> bool:
+		with self._lock:
+			return self._random.random() < rate
+
+	def _fail(self, context, code: grpc.StatusCode, details: str) -> Empty:
+		context.set_code(code)
+		context.set_details(details)
+		logger.error(details)
+		return Empty()
+
+	def ReceiveEncryptedFile(self, request_iterator, context):
+		metadata = dict(context.invocation_metadata())
+		disconnect = self.disconnect_rate and self._roll(self.disconnect_rate)
+
+		# Receive the stream, shaping it through the link
+		filename = ""
+		content_signature = b""
+		encrypted_content = bytearray() if self.tender_private_key else None
+		total_bytes = 0
+		link_bytes = 0
+		for request in request_iterator:
+			# Disconnect once enough bytes have passed and the stream goes on,
+			# so the Encrypter is cut off partway through the file
+			if disconnect and link_bytes >= self.disconnect_after_bytes:
+				with self._lock:
+					self.injected_disconnects += 1
+				context.abort(grpc.StatusCode.UNAVAILABLE, 'Injected disconnect')
+
+			link_bytes += request.ByteSize()
+			if self.link is not None:
+				self.link.transfer(request.ByteSize())
+
+			if filename and request.filename != filename:
+				return self._fail(context, grpc.StatusCode.INVALID_ARGUMENT, 'All chunks must have the same filename')
+			filename = request.filename
+			content_signature = request.content_signature or content_signature
+			total_bytes += len(request.encrypted_content)
+			if encrypted_content is not None:
+				encrypted_content.extend(request.encrypted_content)
+
+		# Inject the latency and errors once the stream is drained
+		if self.latency or self.jitter:
+			with self._lock:
+				jitter = self._random.uniform(0, self.jitter)
+			time.sleep(self.latency + jitter)
+		if self.error_rate and self._roll(self.error_rate):
+			with self._lock:
+				self.injected_errors += 1
+			return self._fail(context, grpc.StatusCode.UNAVAILABLE, 'Injected error')
+
+		with self._lock:
+			self.received_files += 1
+			self.received_bytes += total_bytes
+		if encrypted_content is None:
+			return Empty()
+
+		# Unwrap the data key and decrypt the file
+		try:
+			symmetric_key = self.tender_private_key.decrypt(
+				bytes.fromhex(metadata.get('encrypted_aes_256_key', '')),
+				padding.OAEP(
+					mgf=padding.MGF1(algorithm=hashes.SHA256()),
+					algorithm=hashes.SHA256(),
+					label=None
+				)
+			)
+			cipher_suite = get_cipher_suite(metadata.get('cipher', FERNET_CIPHER_ID))
+			file_bytes = cipher_suite.decrypt(bytes(encrypted_content), symmetric_key)
+		except (ValueError, InvalidTag, InvalidToken) as e:
+			return self._fail(context, grpc.StatusCode.INVALID_ARGUMENT, f'Failed to decrypt {filename}: {e!r}')
+
+		# Verify the signature of the file hash
+		verified = False
+		if self.company_public_key is not None:
+			try:
+				self.company_public_key.verify(content_signature, hashlib.sha256(file_bytes).digest())
+			except InvalidSignature:
+				return self._fail(context, grpc.StatusCode.UNAUTHENTICATED, f'Invalid signature for {filename}')
+			verified = True
+
+		with self._lock:
+			self.decrypted_files += 1
+			if verified:
+				self.verified_files += 1
+			if self.retain_files:
+				self._files[filename] = file_bytes
+		return Empty()
+
+	def RemoveEncryptedFile(self, request, context):
+		with self._lock:
+			self._files.pop(request.filename, None)
+		return Empty()
+
+	def RemoveEncryptedFiles(self, request, context):
+		with self._lock:
+			self._files.clear()
+		return Empty()
+
+	def ListActiveFiles(self, request, context):
+		with self._lock:
+			filenames = list(self._files)
+		return decrypter_pb2.ListActiveFilesResponse(
+			company_files=[decrypter_pb2.CompanyFiles(filenames=filenames)]
+		)
+
+	def DecryptFile(self, request, context):
+		with self._lock:
+			file_bytes = self._files.get(request.filename)
+		if file_bytes is None:
+			context.set_code(grpc.StatusCode.NOT_FOUND)
+			context.set_details(f'File {request.filename} not found')
+			return
+		for i in range(0, len(file_bytes), 1024 * 1024):
+			yield decrypter_pb2.DecryptFileResponse(file_content=file_bytes[i:i + 1024 * 1024])
+
+def create_server(
+	servicer: decrypter_pb2_grpc.DecrypterServicer,
+	host: str = 'localhost',
+	port: int = 0,
+	max_workers: int = 10,
+):
+	"""
+	Create a gRPC server for a Decrypter stand-in.
+
+	Args:
+		servicer (decrypter_pb2_grpc.DecrypterServicer): The servicer to register.
+		host (str): Host to listen on. Default is 'localhost'.
+		port (int): Port to listen on. Default is 0, which picks a free port.
+		max_workers (int): Number of worker threads. Default is 10.
+
+	Returns:
+		tuple: The gRPC server (not started yet) and the bound port.
+	"""
+	server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+	decrypter_pb2_grpc.add_DecrypterServicer_to_server(servicer, server)
+	bound_port = server.add_insecure_port(host + ':' + str(port))
+	return server, bound_port
+
+def add_emulator_arguments(parser: ArgumentParser, prefix: str = ''):
+	"""
+	Add the emulator options to an argument parser.
+
+	Args:
+		parser (ArgumentParser): The argument parser.
+		prefix (str): Prefix for the option names, e.g. 'decrypter-'. Default is none.
+	"""
+	parser.add_argument(f'--{prefix}tender-private-key', type=str, help='Tender private key to unwrap the data keys with')
+	parser.add_argument(f'--{prefix}company-public-key', type=str, help='Company public key to verify the signatures with')
+	parser.add_argument(f'--{prefix}latency', type=float, default=0.0, help='Seconds added before answering each call')
+	parser.add_argument(f'--{prefix}jitter', type=float, default=0.0, help='Maximum random seconds added to the latency')
+	parser.add_argument(f'--{prefix}bandwidth', type=float, default=0.0, help='Throughput cap in bytes per second, 0 for none')
+	parser.add_argument(f'--{prefix}error-rate', type=float, default=0.0, help='Probability of failing a call')
+	parser.add_argument(
+		f'--{prefix}disconnect-rate',
+		type=float,
+		default=0.0,
+		help=f'Probability of aborting a stream once --{prefix}disconnect-after-bytes have been received and more follow',
+	)
+	parser.add_argument(
+		f'--{prefix}disconnect-after-bytes',
+		type=int,
+		default=1024 * 1024,
+		help='Bytes received before an injected disconnect, shorter streams are never disconnected',
+	)
+
+def create_servicer_from_arguments(args, prefix: str = '', **kwargs) -> DecrypterServicer:
+	"""
+	Create an emulator from the options added by add_emulator_arguments.
+
+	Args:
+		args: The parsed arguments.
+		prefix (str): Prefix of the option names. Default is none.
+		**kwargs: Extra arguments for the DecrypterServicer.
+
+	Returns:
+		DecrypterServicer: The emulator.
+
+	Raises:
+		ValueError: If the company public key is given without the tender private key.
+	"""
+	def get(name):
+		return getattr(args, (prefix + name).replace('-', '_'))
+
+	# The signatures are checked on the decrypted files, so verifying them
+	# needs the tender private key too
+	tender_private_key = get('tender-private-key')
+	company_public_key = get('company-public-key')
+	if company_public_key and not tender_private_key:
+		raise ValueError(f'--{prefix}company-public-key requires --{prefix}tender-private-key')
+	return DecrypterServicer(
+		tender_private_key=load_private_key_from_file(tender_private_key) if tender_private_key else None,
+		company_public_key=load_public_key_from_file(company_public_key) if company_public_key else None,
+		latency=get('latency'),
+		jitter=get('jitter'),
+		bytes_per_second=get('bandwidth'),
+		error_rate=get('error-rate'),
+		disconnect_rate=get('disconnect-rate'),
+		disconnect_after_bytes=get('disconnect-after-bytes'),
+		**kwargs,
+	)
+
+if __name__ == '__main__':
+	logging.basicConfig(level=logging.INFO)
+	parser = ArgumentParser(
+		prog='python -m loadtest.decrypter',
+		description='Local emulator of the Decrypter service',
+	)
+	parser.add_argument('--host', type=str, default='localhost', help='Host to listen on')
+	parser.add_argument('--port', type=int, default=50052, help='Port to listen on')
+	parser.add_argument('--retain-files', action='store_true', help='Keep the decrypted files in memory')
+	add_emulator_arguments(parser)
+	args = parser.parse_args()
+
+	try:
+		servicer = create_servicer_from_arguments(args, retain_files=args.retain_files)
+	except ValueError as e:
+		parser.error(str(e))
+	server, port = create_server(servicer, args.host, args.port)
+	server.start()
+	logger.info(f'Decrypter emulator listening on {args.host}:{port}')
+	server.wait_for_termination()
@@ -0,0 +1,204 @@
+import base64
+import os
+import random
+import threading
+import time
+
+import grpc
+
+from ralvarezdev import encrypter_pb2
+from ralvarezdev import encrypter_pb2_grpc
+from loadtest.metrics import RequestRecorder
+
+# Upload modes accepted by run_load
+STREAM_MODE = 'stream'
+PROGRESS_MODE = 'progress'
+FRAMES_MODE = 'frames'
+UNARY_MODE = 'unary'
+MODES = (STREAM_MODE, PROGRESS_MODE, FRAMES_MODE, UNARY_MODE)
+
+# Size suffixes accepted by parse_size
+SIZE_UNITS = {
+	'': 1,
+	'B': 1,
+	'KB': 1000,
+	'MB': 1000 ** 2,
+	'GB': 1000 ** 3,
+	'KIB': 1024,
+	'MIB': 1024 ** 2,
+	'GIB': 1024 ** 3,
+}
+
+def parse_size(value: str) -> int:
+	"""
+	Parse a human-readable size, e.g. '512', '64KiB' or '4MiB'.
+
+	Args:
+		value (str): The size to parse.
+
+	Returns:
+		int: The size in bytes.
+
+	Raises:
+		ValueError: If the size or its unit is not valid.
+	"""
+	value = value.strip()
+	digits = value.rstrip('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ')
+	unit = value[len(digits):].upper()
+	if not digits or unit not in SIZE_UNITS:
+		raise ValueError(f'Invalid size: {value}')
+	return int(float(digits) * SIZE_UNITS[unit])
+
+def parse_size_distribution(value: str) -> list:
+	"""
+	Parse a weighted file size distribution, e.g. '4KiB:70,64KiB:25,8MiB:5'.
+
+	Args:
+		value (str): Comma-separated list of size[:weight] entries.
+
+	Returns:
+		list: The (size, weight) pairs.
+
+	Raises:
+		ValueError: If any entry is not valid.
+	"""
+	distribution = []
+	for entry in value.split(','):
+		size, _, weight = entry.partition(':')
+		distribution.append((parse_size(size), float(weight) if weight else 1.0))
+	if not distribution or any(size <= 0 or weight <= 0 for size, weight in distribution):
+		raise ValueError(f'Invalid size distribution: {value}')
+	return distribution
+
+def send_file_request_generator(
+	filename: str,
+	payload: memoryview,
+	chunk_size: int,
+) -> encrypter_pb2.SendEncryptFileRequest:
+	"""
+	Generator that yields file chunks for the SendEncryptedFile stream.
+
+	Args:
+		filename (str): The name of the file.
+		payload (memoryview): The complete file content.
+		chunk_size (int): The size of each chunk in bytes.
+
+	Yields:
+		encrypter_pb2.SendEncryptFileRequest: The file chunk request.
+	"""
+	for i in range(0, len(payload), chunk_size):
+		yield encrypter_pb2.SendEncryptFileRequest(
+			content=bytes(payload[i:i + chunk_size]),
+			filename=filename,
+		)
+
+def run_load(
+	target: str,
+	concurrency: int,
+	duration: float,
+	distribution: list,
+	chunk_size: int,
+	certificate_b64: str,
+	recorder: RequestRecorder,
+	seed: int | None = None,
+	mode: str = STREAM_MODE,
+):
+	"""
+	Drive the Encrypter service with concurrent uploads for a fixed duration.
+
+	Every worker thread shares a single channel and keeps exactly one upload
+	in flight, picking each file size from the weighted distribution.
+
+	Args:
+		target (str): The Encrypter address as host:port.
+		concurrency (int): Number of concurrent uploads.
+		duration (float): Duration of the run in seconds.
+		distribution (list): The (size, weight) pairs to pick file sizes from.
+		chunk_size (int): The size of each streamed chunk in bytes.
+		certificate_b64 (str): The base64-encoded certificate sent as metadata.
+		recorder (RequestRecorder): The recorder for the request outcomes.
+		seed (int | None): Seed for the file size choices. Default is None.
+		mode (str): 'stream' for SendEncryptedFile, 'progress' for
+			SendEncryptedFileWithProgress, 'frames' for
+			SendEncryptedFileFrames or 'unary' for EncryptFile. Default is
+			'stream'.
+	"""
+	# Imported here since the microservice.grpc configuration is read at
+	# import time, after the in-process Decrypter address has been exported
+	from microservice.grpc.encrypter import (
+		file_frame_generator,
+		send_file_with_progress,
+	)
+
+	sizes = [size for size, _ in distribution]
+	weights = [weight for _, weight in distribution]
+
+	# Random payload shared by all the requests, sliced to each file size
+	payload = memoryview(os.urandom(max(sizes)))
+	metadata = (('certificate', certificate_b64),)
+	deadline = time.perf_counter() + duration
+
+	channel = grpc.insecure_channel(target)
+	stub = encrypter_pb2_grpc.EncrypterStub(channel)
+
+	def worker(worker_id: int):
+		rng = random.Random(None if seed is None else seed + worker_id)
+		sequence = 0
+		while time.perf_counter() < deadline:
+			size = rng.choices(sizes, weights)[0]
+			filename = f'load-{worker_id}-{sequence}.bin'
+			sequence += 1
+
+			start = time.perf_counter()
+			try:
+				if mode == PROGRESS_MODE:
+					send_file_with_progress(
+						stub,
+						filename,
+						payload[:size],
+						chunk_size=chunk_size,
+						metadata=metadata,
+					)
+				elif mode == UNARY_MODE:
+					stub.EncryptFile(
+						encrypter_pb2.EncryptFileRequest(
+							filename=filename,
+							content=bytes(payload[:size]),
+						),
+						metadata=metadata,
+					)
+				elif mode == FRAMES_MODE:
+					stub.SendEncryptedFileFrames(
+						file_frame_generator(filename, payload[:size], chunk_size),
+						metadata=metadata,
+					)
+				else:
+					stub.SendEncryptedFile(
+						send_file_request_generator(filename, payload[:size], chunk_size),
+						metadata=metadata,
+					)
+			except grpc.RpcError as e:
+				recorder.record(time.perf_counter() - start, size, e.code().name)
+			else:
+				recorder.record(time.perf_counter() - start, size)
+
+	workers = [
+		threading.Thread(target=worker, args=(i,), daemon=True)
+		for i in range(concurrency)
+	]
+	try:
+		for thread in workers:
+			thread.start()
+		for thread in workers:
+			thread.join()
+	finally:
+		channel.close()
+
+def default_certificate_b64() -> str:
+	"""
+	Get the placeholder certificate used when none is given.
+
+	Returns:
+		str: The base64-encoded placeholder certificate.
+	"""
+	return base64.b64encode(b'load-test-certificate').decode()
@@ -0,0 +1,161 @@
+import math
+import os
+import threading
+import time
+
+# Page size used to convert /proc/<pid>/statm pages into bytes
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+def read_rss_bytes(pid: int | None = None) -> int | None:
+	"""
+	Read the current resident set size of a process.
+
+	Args:
+		pid (int | None): The process ID. Default is None, which reads this process.
+
+	Returns:
+		int | None: The RSS in bytes, or None if /proc is not available or the process is gone.
+	"""
+	try:
+		with open(f'/proc/{pid or "self"}/statm', 'rb') as f:
+			return int(f.read().split()[1]) * PAGE_SIZE
+	except (OSError, IndexError, ValueError):
+		return None
+
+def percentile(sorted_values: list, fraction: float) -> float:
+	"""
+	Get a percentile from an already sorted list using the nearest-rank method.
+
+	Args:
+		sorted_values (list): The sorted values.
+		fraction (float): The percentile as a fraction, e.g. 0.99 for p99.
+
+	Returns:
+		float: The percentile value, or 0.0 if the list is empty.
+	"""
+	if not sorted_values:
+		return 0.0
+	rank = max(1, math.ceil(fraction * len(sorted_values)))
+	return sorted_values[rank - 1]
+
+class RequestRecorder:
+	"""
+	Thread-safe recorder of request latencies, sizes and outcomes.
+	"""
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		self.latencies = []
+		self.ok_requests = 0
+		self.ok_bytes = 0
+		self.errors = {}
+
+	def record(self, latency: float, size: int, code: str | None = None):
+		"""
+		Record the outcome of a request.
+
+		Args:
+			latency (float): The request latency in seconds.
+			size (int): The payload size in bytes.
+			code (str | None): The gRPC status code name for failed requests.
+		"""
+		with self._lock:
+			if code is None:
+				self.latencies.append(latency)
+				self.ok_requests += 1
+				self.ok_bytes += size
+			else:
+				self.errors[code] = self.errors.get(code, 0) + 1
+
+	def snapshot(self) -> tuple:
+		"""
+		Get the current counters.
+
+		Returns:
+			tuple: The number of successful requests, successful bytes and errors.
+		"""
+		with self._lock:
+			return self.ok_requests, self.ok_bytes, sum(self.errors.values())
+
+	def summary(self, elapsed: float) -> dict:
+		"""
+		Summarize the recorded requests.
+
+		Args:
+			elapsed (float): The elapsed wall time in seconds.
+
+		Returns:
+			dict: Throughput, latency percentiles (in milliseconds) and error rates.
+		"""
+		with self._lock:
+			latencies = sorted(self.latencies)
+			errors = dict(self.errors)
+			ok_requests = self.ok_requests
+			ok_bytes = self.ok_bytes
+
+		total_requests = ok_requests + sum(errors.values())
+		return {
+			'elapsed_s': elapsed,
+			'requests': total_requests,
+			'ok_requests': ok_requests,
+			'requests_per_s': ok_requests / elapsed if elapsed else 0.0,
+			'mib_per_s': ok_bytes / elapsed / (1024 * 1024) if elapsed else 0.0,
+			'p50_ms': percentile(latencies, 0.50) * 1000,
+			'p99_ms': percentile(latencies, 0.99) * 1000,
+			'p999_ms': percentile(latencies, 0.999) * 1000,
+			'max_ms': (latencies[-1] if latencies else 0.0) * 1000,
+			'error_rate': sum(errors.values()) / total_requests if total_requests else 0.0,
+			'errors': errors,
+		}
+
+class RssSampler(threading.Thread):
+	"""
+	Background thread that samples the RSS of a process at a fixed interval.
+	"""
+
+	def __init__(self, interval: float, pid: int | None = None):
+		super().__init__(daemon=True)
+		self.interval = interval
+		self.pid = pid
+		self.samples = []
+		self._started_at = time.perf_counter()
+		self._stop_event = threading.Event()
+
+	def run(self):
+		while True:
+			rss = read_rss_bytes(self.pid)
+			if rss is not None:
+				self.samples.append((time.perf_counter() - self._started_at, rss))
+			if self._stop_event.wait(self.interval):
+				break
+
+	def stop(self):
+		"""
+		Stop sampling and wait for the thread to finish.
+		"""
+		self._stop_event.set()
+		self.join()
+
+	def summary(self) -> dict:
+		"""
+		Summarize the RSS samples.
+
+		The growth is measured from the first sample taken after the first
+		quarter of the run, so that warm-up allocations are not reported as
+		a leak.
+
+		Returns:
+			dict: Start, end, peak and growth of the RSS in MiB, and the samples.
+		"""
+		if not self.samples:
+			return {}
+		mib = 1024 * 1024
+		steady = self.samples[len(self.samples) // 4]
+		last = self.samples[-1]
+		return {
+			'rss_start_mib': self.samples[0][1] / mib,
+			'rss_end_mib': last[1] / mib,
+			'rss_peak_mib': max(rss for _, rss in self.samples) / mib,
+			'rss_steady_growth_mib': (last[1] - steady[1]) / mib,
+			'rss_samples': [(round(t, 3), rss) for t, rss in self.samples],
+		}
@@ -2,27 +2,52 @@ from argparse import ArgumentParser
 from concurrent import futures
 import logging
 import base64
+import hashlib
+import signal
+import threading
+import time
 
 import grpc
 
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey
 from google.protobuf.empty_pb2 import Empty
+from ralvarezdev import encrypter_pb2
 from ralvarezdev import encrypter_pb2_grpc
 from ralvarezdev import decrypter_pb2
 from crypto.aes.encryption import (
-	encrypt_file_with_symmetric_key,
-	generate_256_bits_key,
 	encrypt_symmetric_key_with_public_key,
 )
+from crypto.cipher import (
+	AUTO_CIPHER_ID,
+	CIPHER_SUITES,
+	ENCRYPTER_CIPHER,
+	FERNET_CIPHER_ID,
+	KEY_POOL_DEPTH,
+	KEY_POOL_STATS_INTERVAL,
+	SEGMENT_THRESHOLD_BYTES,
+	SEGMENTED_CIPHER_IDS,
+	CipherSuite,
+	calibrate_cipher_suite,
+	get_cipher_suite,
+)
+from crypto.cipher.pool import DataKeyPool
 from crypto.rsa import (
 	TENDER_PUBLIC_KEY,
+	TENDER_PUBLIC_KEY_PATH,
 )
+from crypto import load_public_key_from_file
 from crypto.ed25519 import (
 	COMPANY_PRIVATE_KEY,
 )
-from microservice.grpc.decrypter import create_grpc_client
+from microservice.grpc.decrypter import get_grpc_client
 from microservice.grpc import (
 	DECRYPTER_GRPC_HOST,
-	DECRYPTER_GRPC_PORT
+	DECRYPTER_GRPC_PORT,
+	FORWARD_CHUNK_SIZE,
+	MAX_PREALLOCATION_BYTES,
+	PROGRESS_ACK_BYTES,
+	PROGRESS_WINDOW_BYTES,
+	UNARY_MAX_FILE_BYTES,
 )
 from crypto.sha.signature import sign_file_with_private_key
 
@@ -30,6 +55,10 @@ from crypto.sha.signature import sign_file_with_private_key
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# The Decrypter address is required to forward the encrypted files
+if not DECRYPTER_GRPC_HOST or not DECRYPTER_GRPC_PORT:
+	raise RuntimeError("DECRYPTER_GRPC_HOST and DECRYPTER_GRPC_PORT must be set")
+
 def receive_file_request_generator(
 	filename: str,
 	file_bytes: bytes,
@@ -56,70 +85,219 @@ def receive_file_request_generator(
 			content_signature=content_signature,
 		)
 
+def receive_segments_request_generator(
+	filename: str,
+	segments,
+	content_signature: bytes,
+	chunk_size: int = 1024
+) -> decrypter_pb2.ReceiveEncryptedFileRequest:
+	"""
+	Generator that yields file chunks for gRPC streaming from the ordered
+	pieces of a segmented encryption, as soon as enough of them are ready.
+
+	Args:
+		filename (str): The name of the file.
+		segments (Iterable[bytes]): The ordered pieces of the encrypted file.
+		content_signature (bytes): The digital signature of the file content.
+		chunk_size (int): The size of each chunk in bytes. Default is 1024 bytes.
+
+	Yields:
+		decrypter_pb2.ReceiveEncryptedFileRequest: The file chunk request.
+	"""
+	buffer = bytearray()
+	for segment in segments:
+		buffer.extend(segment)
+		while len(buffer) >= chunk_size:
+			yield decrypter_pb2.ReceiveEncryptedFileRequest(
+				encrypted_content=bytes(buffer[:chunk_size]),
+				filename=filename,
+				content_signature=content_signature,
+			)
+			del buffer[:chunk_size]
+	if buffer:
+		yield decrypter_pb2.ReceiveEncryptedFileRequest(
+			encrypted_content=bytes(buffer),
+			filename=filename,
+			content_signature=content_signature,
+		)
+
+def get_certificate_b64(context) -> str | None:
+	"""
+	Get the base64-encoded client certificate from the call metadata.
+
+	Args:
+		context: The gRPC context of the incoming call.
+
+	Returns:
+		str | None: The base64-encoded certificate, or None if the context was set to an error.
+	"""
+	for key, value in context.invocation_metadata():
+		if key == 'certificate' and base64.b64decode(value):
+			return value
+	context.set_code(grpc.StatusCode.UNAUTHENTICATED)
+	context.set_details('Certificate metadata is required')
+	logger.error("Missing certificate metadata")
+	return None
+
+def validate_file_chunk(
+	request: encrypter_pb2.SendEncryptFileRequest,
+	filename: str,
+	context,
+) -> bool:
+	"""
+	Validate a received file chunk.
+
+	Args:
+		request (encrypter_pb2.SendEncryptFileRequest): The file chunk request.
+		filename (str): The filename of the previous chunks, empty for the first chunk.
+		context: The gRPC context of the incoming call.
+
+	Returns:
+		bool: True if the chunk is valid, False if the context was set to an error.
+	"""
+	if not request.filename or not request.content:
+		context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+		context.set_details('Filename and content are required')
+		logger.error("Invalid request: missing filename or content")
+		return False
+
+	# Ensure all chunks belong to the same file
+	if filename and filename != request.filename:
+		context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+		context.set_details('All chunks must have the same filename')
+		logger.error("All chunks must have the same filename")
+		return False
+	return True
+
+def get_requested_cipher_suite(
+	cipher_id: str,
+	default: CipherSuite,
+	context,
+) -> CipherSuite | None:
+	"""
+	Get the cipher suite requested by the client.
+
+	Args:
+		cipher_id (str): The requested cipher ID, empty for the default.
+		default (CipherSuite): The cipher suite used when none is requested.
+		context: The gRPC context of the incoming call.
+
+	Returns:
+		CipherSuite | None: The cipher suite, or None if the context was set to an error.
+	"""
+	if not cipher_id:
+		return default
+	try:
+		return get_cipher_suite(cipher_id)
+	except ValueError as e:
+		context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+		context.set_details(str(e))
+		logger.error(f"Invalid request: {e}")
+		return None
+
+def resolve_cipher_suite(cipher_id: str) -> CipherSuite:
+	"""
+	Get the cipher suite to encrypt files with.
+
+	Args:
+		cipher_id (str): The cipher ID, or 'auto' to pick the fastest AEAD on this host.
+
+	Returns:
+		CipherSuite: The cipher suite.
+
+	Raises:
+		ValueError: If the cipher ID is not registered.
+	"""
+	if cipher_id != AUTO_CIPHER_ID:
+		return get_cipher_suite(cipher_id)
+
+	# Calibrate the AEAD ciphers on this host
+	suite, timings = calibrate_cipher_suite()
+	for calibrated_id, elapsed in timings.items():
+		logger.info(f"Cipher {calibrated_id} calibration: {elapsed * 1000:.2f} ms per round")
+	return suite
+
 class EncrypterServicer(encrypter_pb2_grpc.EncrypterServicer):
-	def SendEncryptedFile(self, request_iterator, context):
-		# Get the certificate bytes from metadata
-		cert_bytes = None
-		cert_bytes_b64 = None
-		for key, value in context.invocation_metadata():
-			if key == 'certificate':
-				cert_bytes_b64 = value
-				cert_bytes = base64.b64decode(value)
-				break
-		if not cert_bytes:
-			context.set_code(grpc.StatusCode.UNAUTHENTICATED)
-			context.set_details('Certificate metadata is required')
-			logger.error("Missing certificate metadata")
-			return Empty()
+	def __init__(
+		self,
+		cipher_suite: CipherSuite = None,
+		public_key=None,
+		key_pool_depth: int = 0,
+	):
+		"""
+		Initialize the servicer.
 
-		# Accumulate file chunks
-		file_bytes = bytearray()
-		filename = ""
+		Args:
+			cipher_suite (CipherSuite, optional): The cipher suite to encrypt files with. Defaults to Fernet.
+			public_key (optional): The public key to wrap the data keys with. Defaults to the tender's public key.
+			key_pool_depth (int): Depth of the pool of pre-wrapped data keys for the cipher suite. Default is 0, which disables it.
+		"""
+		self.cipher_suite = cipher_suite or get_cipher_suite(FERNET_CIPHER_ID)
+		self.public_key = public_key or TENDER_PUBLIC_KEY
 
-		# Process each chunk in the stream
-		for request in request_iterator:
-			# Validate request
-			if not request.filename or not request.content:
-				context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
-				context.set_details('Filename and content are required')
-				logger.error("Invalid request: missing filename or content")
-				return Empty()
+		# Start the pool of pre-wrapped data keys
+		self.key_pool = None
+		if key_pool_depth > 0:
+			self.key_pool = DataKeyPool(self.cipher_suite, self.public_key, key_pool_depth)
+			self.key_pool.start()
 
-			# Ensure all chunks belong to the same file
-			if not filename:
-				filename = request.filename
-			elif filename != request.filename:
-				context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
-				context.set_details('All chunks must have the same filename')
-				logger.error("All chunks must have the same filename")
-				return Empty
+	def rotate_public_key(self, public_key):
+		"""
+		Switch to a new public key, flushing the data keys wrapped with the old one.
 
-			# Append chunk to the file bytes
-			file_bytes.extend(request.content)
-			if not file_bytes:
-				context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
-				context.set_details('No file data received')
-				logger.error("No file data received")
-				return Empty()
+		Args:
+			public_key: The new public key object.
+		"""
+		self.public_key = public_key
+		if self.key_pool is not None:
+			self.key_pool.rotate(public_key)
+
+	def _encrypt_and_forward(
+		self,
+		filename: str,
+		file_bytes: bytes,
+		cert_bytes_b64: str,
+		context,
+		cipher_suite: CipherSuite = None,
+	) -> bool:
+		"""
+		Encrypt a received file and forward it to the Decrypter service.
+
+		Args:
+			filename (str): The name of the file.
+			file_bytes (bytes): The complete file content.
+			cert_bytes_b64 (str): The base64-encoded client certificate.
+			context: The gRPC context of the incoming call.
+			cipher_suite (CipherSuite, optional): The cipher suite to encrypt the file with. Defaults to the servicer's.
+
+		Returns:
+			bool: True if the file was forwarded, False if the context was set to an error.
+		"""
+		cipher_suite = cipher_suite or self.cipher_suite
 
 		# Iterate over received files and print their sizes
 		total_bytes = len(file_bytes)
 		logger.info(f"Received file: {filename}, Size: {total_bytes} bytes")
 
-		# Generate AES symmetric key
-		symmetric_key = generate_256_bits_key()
-
-		# Encrypt the file with the symmetric key
-		encrypted_file_bytes = encrypt_file_with_symmetric_key(
-			file_bytes=bytes(file_bytes),
-			key=symmetric_key,
-		)
+		# Get a pre-wrapped symmetric key from the pool, or generate and wrap one
+		if self.key_pool is not None and cipher_suite is self.key_pool.cipher_suite:
+			symmetric_key, encrypted_symmetric_key = self.key_pool.pop()
+		else:
+			symmetric_key = cipher_suite.generate_key()
+			encrypted_symmetric_key = encrypt_symmetric_key_with_public_key(
+				symmetric_key=symmetric_key,
+				public_key=self.public_key,
+			)
 
-		# Encrypt the symmetric key with the tender's public key
-		encrypted_symmetric_key = encrypt_symmetric_key_with_public_key(
-			symmetric_key=symmetric_key,
-			public_key=TENDER_PUBLIC_KEY,
-		)
+		# Large files are encrypted as segments on all the cores, with the
+		# segmented variant of the cipher that shares its key format, if the
+		# segment threshold is enabled
+		if (
+			SEGMENT_THRESHOLD_BYTES > 0
+			and len(file_bytes) >= SEGMENT_THRESHOLD_BYTES
+			and cipher_suite.id in SEGMENTED_CIPHER_IDS
+		):
+			cipher_suite = get_cipher_suite(SEGMENTED_CIPHER_IDS[cipher_suite.id])
 
 		# Calculate content hash (simple length-based hash for demonstration)
 		content_signature = sign_file_with_private_key(
@@ -127,51 +305,336 @@ class EncrypterServicer(encrypter_pb2_grpc.EncrypterServicer):
 			private_key=COMPANY_PRIVATE_KEY,
 		)
 
-		# Send encrypted file to Decrypter service
-		channel, client = create_grpc_client(
+		# Send encrypted file to Decrypter service through the shared channel
+		_, client = get_grpc_client(
 			host=DECRYPTER_GRPC_HOST,
 			port=DECRYPTER_GRPC_PORT,
 		)
 
 		# Prepare the request
 		metadata = (('certificate', cert_bytes_b64),
-		            ('encrypted_aes_256_key', encrypted_symmetric_key.hex()))
+		            ('encrypted_aes_256_key', encrypted_symmetric_key.hex()),
+		            ('cipher', cipher_suite.id))
+
+		# Segments are forwarded in order while the later ones are still being
+		# encrypted, other ciphers encrypt the whole file first
+		if cipher_suite.encrypt_segments is not None:
+			requests = receive_segments_request_generator(
+				filename,
+				cipher_suite.encrypt_segments(file_bytes, symmetric_key),
+				content_signature,
+				chunk_size=FORWARD_CHUNK_SIZE,
+			)
+		else:
+			encrypted_file_bytes = cipher_suite.encrypt(
+				bytes(file_bytes),
+				symmetric_key,
+			)
+
+			# Small files fit in a single message, so skip the chunking generator
+			if len(encrypted_file_bytes) <= FORWARD_CHUNK_SIZE:
+				requests = iter((decrypter_pb2.ReceiveEncryptedFileRequest(
+					encrypted_content=encrypted_file_bytes,
+					filename=filename,
+					content_signature=content_signature,
+				),))
+			else:
+				requests = receive_file_request_generator(
+					filename,
+					encrypted_file_bytes,
+					content_signature,
+					chunk_size=FORWARD_CHUNK_SIZE,
+				)
 
 		# Call the Decrypter service
 		try:
-			client.ReceiveEncryptedFile(
-				receive_file_request_generator(filename, encrypted_file_bytes, content_signature, chunk_size=1024*1024),
-				metadata=metadata
-			)
+			client.ReceiveEncryptedFile(requests, metadata=metadata)
 		except grpc.RpcError as e:
 			context.set_code(e.code())
 			context.set_details(e.details())
 			logger.error(f"gRPC error from Decrypter service: {e.code()} - {e.details()}")
-			return Empty()
-		finally:
-			channel.close()
+			return False
 
-		# Return success response
 		logger.info(f"File {filename} encrypted and sent successfully")
+		return True
+
+	def EncryptFile(self, request, context):
+		# Get the certificate bytes from metadata
+		cert_bytes_b64 = get_certificate_b64(context)
+		if not cert_bytes_b64:
+			return Empty()
+
+		# Validate request
+		if not request.filename or not request.content:
+			context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+			context.set_details('Filename and content are required')
+			logger.error("Invalid request: missing filename or content")
+			return Empty()
+		if len(request.content) > UNARY_MAX_FILE_BYTES:
+			context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+			context.set_details(f'Files larger than {UNARY_MAX_FILE_BYTES} bytes must be streamed')
+			logger.error(f"File {request.filename} is too large for a unary request")
+			return Empty()
+
+		# Get the requested cipher suite
+		cipher_suite = get_requested_cipher_suite(request.cipher, self.cipher_suite, context)
+		if cipher_suite is None:
+			return Empty()
+
+		# Encrypt and forward the file, without copying its content
+		self._encrypt_and_forward(request.filename, request.content, cert_bytes_b64, context, cipher_suite)
+		return Empty()
+
+	def SendEncryptedFile(self, request_iterator, context):
+		# Get the certificate bytes from metadata
+		cert_bytes_b64 = get_certificate_b64(context)
+		if not cert_bytes_b64:
+			return Empty()
+
+		# Accumulate file chunks
+		file_bytes = bytearray()
+		filename = ""
+
+		# Process each chunk in the stream
+		for request in request_iterator:
+			if not validate_file_chunk(request, filename, context):
+				return Empty()
+			filename = request.filename
+
+			# Append chunk to the file bytes
+			file_bytes.extend(request.content)
+
+		if not file_bytes:
+			context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+			context.set_details('No file data received')
+			logger.error("No file data received")
+			return Empty()
+
+		# Encrypt and forward the file
+		self._encrypt_and_forward(filename, file_bytes, cert_bytes_b64, context)
 		return Empty()
 
-def serve(host: str, port: int):
+	def SendEncryptedFileWithProgress(self, request_iterator, context):
+		# Get the certificate bytes from metadata
+		cert_bytes_b64 = get_certificate_b64(context)
+		if not cert_bytes_b64:
+			return
+
+		# Grant the initial credit window before any chunk is received
+		yield encrypter_pb2.SendEncryptFileProgress(
+			committed_bytes=0,
+			window_bytes=PROGRESS_WINDOW_BYTES,
+		)
+
+		# Accumulate file chunks
+		file_bytes = bytearray()
+		filename = ""
+		acked_bytes = 0
+
+		# Process each chunk in the stream, failing as soon as one is invalid
+		for request in request_iterator:
+			if not validate_file_chunk(request, filename, context):
+				return
+			filename = request.filename
+
+			# Append chunk to the file bytes
+			file_bytes.extend(request.content)
+
+			# Acknowledge the committed bytes, which slides the client's window
+			if len(file_bytes) - acked_bytes >= PROGRESS_ACK_BYTES:
+				acked_bytes = len(file_bytes)
+				yield encrypter_pb2.SendEncryptFileProgress(
+					committed_bytes=acked_bytes,
+					window_bytes=PROGRESS_WINDOW_BYTES,
+				)
+
+		if not file_bytes:
+			context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+			context.set_details('No file data received')
+			logger.error("No file data received")
+			return
+
+		# Encrypt and forward the file
+		if not self._encrypt_and_forward(filename, file_bytes, cert_bytes_b64, context):
+			return
+		yield encrypter_pb2.SendEncryptFileProgress(
+			committed_bytes=len(file_bytes),
+			window_bytes=PROGRESS_WINDOW_BYTES,
+			done=True,
+		)
+
+	def SendEncryptedFileFrames(self, request_iterator, context):
+		# Get the certificate bytes from metadata
+		cert_bytes_b64 = get_certificate_b64(context)
+		if not cert_bytes_b64:
+			return Empty()
+
+		# The first frame must be the header
+		header = next(request_iterator, None)
+		if header is None or header.WhichOneof('frame') != 'header' or not header.header.filename:
+			context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+			context.set_details('The first frame must be a header with the filename')
+			logger.error("Invalid request: missing header frame")
+			return Empty()
+		filename = header.header.filename
+
+		# Get the requested cipher suite
+		cipher_suite = get_requested_cipher_suite(header.header.cipher, self.cipher_suite, context)
+		if cipher_suite is None:
+			return Empty()
+
+		# The file buffer is preallocated from the size hint as data arrives
+		size_hint = header.header.size_hint
+		file_bytes = bytearray()
+		file_view = memoryview(file_bytes)
+		file_size = 0
+		file_hash = hashlib.sha256()
+		trailer = None
+
+		# Process each data frame until the trailer
+		for request in request_iterator:
+			frame = request.WhichOneof('frame')
+			if trailer is not None or frame not in ('data', 'trailer'):
+				context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+				context.set_details('Only data frames are allowed between the header and the trailer')
+				logger.error(f"Invalid request: unexpected {frame} frame")
+				return Empty()
+			if frame == 'trailer':
+				trailer = request.trailer
+				continue
+
+			# Copy the data into the preallocated buffer if it fits, otherwise
+			# append it and grow the buffer towards the size hint, to at most
+			# twice the received bytes and MAX_PREALLOCATION_BYTES ahead of
+			# them, so the client cannot force an allocation without sending
+			# the data
+			data = request.data
+			end = file_size + len(data)
+			if end <= len(file_bytes):
+				file_view[file_size:end] = data
+			else:
+				file_view.release()
+				del file_bytes[file_size:]
+				file_bytes.extend(data)
+				if size_hint > end:
+					file_bytes.extend(bytes(min(size_hint, 2 * end, end + MAX_PREALLOCATION_BYTES) - end))
+				file_view = memoryview(file_bytes)
+			file_size = end
+			file_hash.update(data)
+
+		file_view.release()
+		del file_bytes[file_size:]
+		if trailer is None:
+			context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+			context.set_details('The last frame must be a trailer')
+			logger.error("Invalid request: missing trailer frame")
+			return Empty()
+		if not file_bytes:
+			context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+			context.set_details('No file data received')
+			logger.error("No file data received")
+			return Empty()
+
+		# Check the file digest sent in the trailer
+		if trailer.sha256_digest and trailer.sha256_digest != file_hash.digest():
+			context.set_code(grpc.StatusCode.DATA_LOSS)
+			context.set_details('File digest does not match the trailer')
+			logger.error(f"File {filename} digest does not match the trailer")
+			return Empty()
+
+		# Encrypt and forward the file
+		self._encrypt_and_forward(filename, file_bytes, cert_bytes_b64, context, cipher_suite)
+		return Empty()
+
+def create_server(
+	host: str,
+	port: int,
+	max_workers: int = 10,
+	cipher_suite: CipherSuite = None,
+	key_pool_depth: int = KEY_POOL_DEPTH,
+):
 	"""
-	Start the gRPC server.
+	Create the gRPC server with the Encrypter servicer registered.
 
 	Args:
 		host (str): Host to listen on.
-		port (int): Port to listen on.
+		port (int): Port to listen on. Use 0 to pick a free port.
+		max_workers (int): Number of worker threads. Default is 10.
+		cipher_suite (CipherSuite, optional): The cipher suite to encrypt files with. Defaults to Fernet.
+		key_pool_depth (int): Depth of the pool of pre-wrapped data keys, 0 disables it. Defaults to ENCRYPTER_KEY_POOL_DEPTH.
+
+	Returns:
+		tuple: The gRPC server (not started yet), the bound port and the servicer.
 	"""
 	# Create gRPC server
-	server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+	server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
 
 	# Register the servicer
+	servicer = EncrypterServicer(cipher_suite, key_pool_depth=key_pool_depth)
 	encrypter_pb2_grpc.add_EncrypterServicer_to_server(
-		EncrypterServicer(),
+		servicer,
 		server,
 		)
-	server.add_insecure_port(host + ':' + str(port))
+	bound_port = server.add_insecure_port(host + ':' + str(port))
+	return server, bound_port, servicer
+
+def log_key_pool_stats(key_pool: DataKeyPool, interval: float):
+	"""
+	Log the data key pool stats at a fixed interval, forever.
+
+	Args:
+		key_pool (DataKeyPool): The data key pool.
+		interval (float): Seconds between logs.
+	"""
+	while True:
+		time.sleep(interval)
+		stats = key_pool.stats()
+		logger.info(
+			f"Key pool: {stats['size']}/{stats['depth']} keys, "
+			f"refill {stats['refill_per_s']:.1f} keys/s, pop {stats['pop_per_s']:.1f} keys/s, "
+			f"{stats['underflows']}/{stats['popped']} underflows, "
+			f"{stats['flushed']} flushed"
+		)
+
+def serve(host: str, port: int, cipher_suite: CipherSuite = None):
+	"""
+	Start the gRPC server.
+
+	The tender's public key is reloaded from its file on SIGHUP.
+
+	Args:
+		host (str): Host to listen on.
+		port (int): Port to listen on.
+		cipher_suite (CipherSuite, optional): The cipher suite to encrypt files with. Defaults to Fernet.
+	"""
+	server, _, servicer = create_server(host, port, cipher_suite=cipher_suite)
+
+	# Reload the tender's public key on SIGHUP, which is not available on Windows
+	if hasattr(signal, 'SIGHUP'):
+		def rotate_public_key(signum, frame):
+			logger.info(f"Reloading tender's public key from {TENDER_PUBLIC_KEY_PATH}")
+
+			# Keep the current key and pool if the new key cannot be used, an
+			# exception here would be raised in the main thread and stop the server
+			try:
+				public_key = load_public_key_from_file(TENDER_PUBLIC_KEY_PATH)
+			except (OSError, ValueError, TypeError) as e:
+				logger.error(f"Failed to reload tender's public key, keeping the current one: {e}")
+				return
+			if not isinstance(public_key, RSAPublicKey):
+				logger.error("Tender's public key is not an RSA key, keeping the current one")
+				return
+			servicer.rotate_public_key(public_key)
+		signal.signal(signal.SIGHUP, rotate_public_key)
+
+	# Log the data key pool stats
+	if servicer.key_pool is not None and KEY_POOL_STATS_INTERVAL > 0:
+		threading.Thread(
+			target=log_key_pool_stats,
+			args=(servicer.key_pool, KEY_POOL_STATS_INTERVAL),
+			daemon=True,
+		).start()
+
 	server.start()
 	server.wait_for_termination()
 
@@ -186,8 +649,19 @@ if __name__ == '__main__':
 		help='Host to listen on',
 		)
 	parser.add_argument('--port', type=int, help='Port to listen on')
+	parser.add_argument(
+		'--cipher',
+		type=str,
+		default=ENCRYPTER_CIPHER,
+		choices=[*CIPHER_SUITES, AUTO_CIPHER_ID],
+		help='Cipher to encrypt files with, or auto to pick the fastest AEAD on this host',
+		)
 	args = parser.parse_args()
+
+	# Select the cipher suite
+	cipher_suite = resolve_cipher_suite(args.cipher)
+	logger.info(f'Encrypting files with {cipher_suite.id}')
 	logger.info(f'Starting server on {args.host}:{args.port}')
 
 	# Start the gRPC server
-	serve(args.host, args.port)
+	serve(args.host, args.port, cipher_suite)
@@ -5,6 +5,28 @@ from dotenv import load_dotenv
 # Load environment variables from a .env file
 load_dotenv()
 
-# Get gRPC server configuration from environment variables
+# Get gRPC server configuration from environment variables, they are only
+# required by the Encrypter server, not by the client helpers
 DECRYPTER_GRPC_HOST = os.getenv("DECRYPTER_GRPC_HOST")
-DECRYPTER_GRPC_PORT = int(os.getenv("DECRYPTER_GRPC_PORT"))
+DECRYPTER_GRPC_PORT = int(os.getenv("DECRYPTER_GRPC_PORT") or 0)
+
+# Get the progress acknowledgement configuration for bidirectional uploads.
+# The window only bounds the bytes the client keeps in flight, the server
+# still buffers the whole file. Acknowledgements are sent every
+# PROGRESS_ACK_BYTES, or every half window if that is smaller, so a client
+# blocked on a full window always gets an acknowledgement
+PROGRESS_WINDOW_BYTES = int(os.getenv("ENCRYPTER_PROGRESS_WINDOW_BYTES", 4 * 1024 * 1024))
+PROGRESS_ACK_BYTES = min(
+	int(os.getenv("ENCRYPTER_PROGRESS_ACK_BYTES", 1024 * 1024)),
+	max(1, PROGRESS_WINDOW_BYTES // 2),
+)
+
+# Get the maximum file buffer preallocated ahead of the received bytes from
+# the size hint of framed uploads
+MAX_PREALLOCATION_BYTES = int(os.getenv("ENCRYPTER_MAX_PREALLOCATION_BYTES", 4 * 1024 * 1024))
+
+# Get the maximum file size accepted by the unary EncryptFile request
+UNARY_MAX_FILE_BYTES = int(os.getenv("ENCRYPTER_UNARY_MAX_FILE_BYTES", 64 * 1024))
+
+# Get the size of each chunk forwarded to the Decrypter service
+FORWARD_CHUNK_SIZE = int(os.getenv("DECRYPTER_FORWARD_CHUNK_SIZE", 1024 * 1024))
@@ -1,3 +1,5 @@
+import threading
+
 import grpc
 
 import ralvarezdev.decrypter_pb2_grpc as decrypter_pb2_grpc
@@ -15,4 +17,28 @@ def create_grpc_client(host: str, port: int):
     """
     channel = grpc.insecure_channel(f"{host}:{port}")
     stub = decrypter_pb2_grpc.DecrypterStub(channel)
-    return channel, stub
\ No newline at end of file
+    return channel, stub
+
+# Shared clients, keyed by their server address
+_grpc_clients = {}
+_grpc_clients_lock = threading.Lock()
+
+def get_grpc_client(host: str, port: int):
+    """
+    Returns a gRPC client stub shared by every caller for the same server.
+
+	The channel is created on first use and kept open, so requests do not pay
+	for a new connection each time.
+
+	Args:
+		host (str): The server host.
+		port (int): The server port.
+
+	Returns:
+		decrypter_pb2_grpc.DecrypterStub: The gRPC client stub.
+    """
+    with _grpc_clients_lock:
+        client = _grpc_clients.get((host, port))
+        if client is None:
+            client = _grpc_clients[(host, port)] = create_grpc_client(host, port)
+    return client
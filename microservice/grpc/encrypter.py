@@ -0,0 +1,136 @@
+import hashlib
+import threading
+
+import grpc
+
+from ralvarezdev import encrypter_pb2
+import ralvarezdev.encrypter_pb2_grpc as encrypter_pb2_grpc
+
+def create_grpc_client(host: str, port: int):
+	"""
+	Creates and returns a gRPC client stub.
+
+	Args:
+		host (str): The server host.
+		port (int): The server port.
+
+	Returns:
+		encrypter_pb2_grpc.EncrypterStub: The gRPC client stub.
+	"""
+	channel = grpc.insecure_channel(f"{host}:{port}")
+	stub = encrypter_pb2_grpc.EncrypterStub(channel)
+	return channel, stub
+
+def send_file_with_progress(
+	stub: encrypter_pb2_grpc.EncrypterStub,
+	filename: str,
+	file_bytes: bytes,
+	chunk_size: int = 64 * 1024,
+	metadata=None,
+	on_progress=None,
+	timeout: float | None = None,
+) -> encrypter_pb2.SendEncryptFileProgress:
+	"""
+	Upload a file through SendEncryptedFileWithProgress, keeping at most the
+	server's credit window of bytes in flight.
+
+	Args:
+		stub (encrypter_pb2_grpc.EncrypterStub): The gRPC client stub.
+		filename (str): The name of the file.
+		file_bytes (bytes): The complete file content.
+		chunk_size (int): The size of each chunk in bytes. Default is 64 KiB.
+		metadata (optional): The call metadata, e.g. the certificate.
+		on_progress (callable, optional): Called with every progress acknowledgement.
+		timeout (float | None): Deadline of the call in seconds. Default is None, which waits forever.
+
+	Returns:
+		encrypter_pb2.SendEncryptFileProgress: The final acknowledgement.
+
+	Raises:
+		grpc.RpcError: If the server fails the upload.
+	"""
+	condition = threading.Condition()
+	state = {
+		'committed_bytes': 0,
+		# Allow the first chunk before the initial window is received
+		'window_bytes': chunk_size,
+		'closed': False,
+	}
+	file_view = memoryview(file_bytes)
+
+	def request_generator():
+		for i in range(0, len(file_view), chunk_size):
+			chunk = file_view[i:i + chunk_size]
+
+			# Wait until the chunk fits in the credit window
+			with condition:
+				condition.wait_for(
+					lambda: state['closed']
+					or i <= state['committed_bytes']
+					or i + len(chunk) <= state['committed_bytes'] + state['window_bytes']
+				)
+				if state['closed']:
+					return
+			yield encrypter_pb2.SendEncryptFileRequest(
+				content=bytes(chunk),
+				filename=filename,
+			)
+
+	last_progress = None
+	try:
+		for progress in stub.SendEncryptedFileWithProgress(
+			request_generator(),
+			metadata=metadata,
+			timeout=timeout,
+		):
+			with condition:
+				state['committed_bytes'] = progress.committed_bytes
+				state['window_bytes'] = progress.window_bytes
+				condition.notify_all()
+			if on_progress is not None:
+				on_progress(progress)
+			last_progress = progress
+	finally:
+		# Release the request generator if the call ended early
+		with condition:
+			state['closed'] = True
+			condition.notify_all()
+	return last_progress
+
+def file_frame_generator(
+	filename: str,
+	file_bytes: bytes,
+	chunk_size: int = 64 * 1024,
+	cipher: str = "",
+) -> encrypter_pb2.EncryptFileFrame:
+	"""
+	Generator that yields the header, data and trailer frames of a file for
+	SendEncryptedFileFrames.
+
+	Args:
+		filename (str): The name of the file.
+		file_bytes (bytes): The complete file content.
+		chunk_size (int): The size of each data frame in bytes. Default is 64 KiB.
+		cipher (str): The cipher ID to encrypt the file with. Default is the server's.
+
+	Yields:
+		encrypter_pb2.EncryptFileFrame: The file frame.
+	"""
+	yield encrypter_pb2.EncryptFileFrame(
+		header=encrypter_pb2.EncryptFileHeader(
+			filename=filename,
+			size_hint=len(file_bytes),
+			cipher=cipher,
+		)
+	)
+
+	file_view = memoryview(file_bytes)
+	file_hash = hashlib.sha256()
+	for i in range(0, len(file_view), chunk_size):
+		chunk = file_view[i:i + chunk_size]
+		file_hash.update(chunk)
+		yield encrypter_pb2.EncryptFileFrame(data=bytes(chunk))
+
+	yield encrypter_pb2.EncryptFileFrame(
+		trailer=encrypter_pb2.EncryptFileTrailer(sha256_digest=file_hash.digest())
+	)
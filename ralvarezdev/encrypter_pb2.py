@@ -25,15 +25,25 @@ _sym_db = _symbol_database.Default()
 from google.protobuf import empty_pb2 as google_dot_protobuf_dot_empty__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1bralvarezdev/encrypter.proto\x12\x0bralvarezdev\x1a\x1bgoogle/protobuf/empty.proto\";\n\x16SendEncryptFileRequest\x12\x0f\n\x07\x63ontent\x18\x01 \x01(\x0c\x12\x10\n\x08\x66ilename\x18\x02 \x01(\t2_\n\tEncrypter\x12R\n\x11SendEncryptedFile\x12#.ralvarezdev.SendEncryptFileRequest\x1a\x16.google.protobuf.Empty(\x01\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1bralvarezdev/encrypter.proto\x12\x0bralvarezdev\x1a\x1bgoogle/protobuf/empty.proto\"G\n\x12\x45ncryptFileRequest\x12\x10\n\x08\x66ilename\x18\x01 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x02 \x01(\x0c\x12\x0e\n\x06\x63ipher\x18\x03 \x01(\t\";\n\x16SendEncryptFileRequest\x12\x0f\n\x07\x63ontent\x18\x01 \x01(\x0c\x12\x10\n\x08\x66ilename\x18\x02 \x01(\t\"V\n\x17SendEncryptFileProgress\x12\x17\n\x0f\x63ommitted_bytes\x18\x01 \x01(\x04\x12\x14\n\x0cwindow_bytes\x18\x02 \x01(\x04\x12\x0c\n\x04\x64one\x18\x03 \x01(\x08\"H\n\x11\x45ncryptFileHeader\x12\x10\n\x08\x66ilename\x18\x01 \x01(\t\x12\x11\n\tsize_hint\x18\x02 \x01(\x04\x12\x0e\n\x06\x63ipher\x18\x03 \x01(\t\"+\n\x12\x45ncryptFileTrailer\x12\x15\n\rsha256_digest\x18\x01 \x01(\x0c\"\x91\x01\n\x10\x45ncryptFileFrame\x12\x30\n\x06header\x18\x01 \x01(\x0b\x32\x1e.ralvarezdev.EncryptFileHeaderH\x00\x12\x0e\n\x04\x64\x61ta\x18\x02 \x01(\x0cH\x00\x12\x32\n\x07trailer\x18\x03 \x01(\x0b\x32\x1f.ralvarezdev.EncryptFileTrailerH\x00\x42\x07\n\x05\x66rame2\xeb\x02\n\tEncrypter\x12\x46\n\x0b\x45ncryptFile\x12\x1f.ralvarezdev.EncryptFileRequest\x1a\x16.google.protobuf.Empty\x12R\n\x11SendEncryptedFile\x12#.ralvarezdev.SendEncryptFileRequest\x1a\x16.google.protobuf.Empty(\x01\x12n\n\x1dSendEncryptedFileWithProgress\x12#.ralvarezdev.SendEncryptFileRequest\x1a$.ralvarezdev.SendEncryptFileProgress(\x01\x30\x01\x12R\n\x17SendEncryptedFileFrames\x12\x1d.ralvarezdev.EncryptFileFrame\x1a\x16.google.protobuf.Empty(\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'ralvarezdev.encrypter_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_SENDENCRYPTFILEREQUEST']._serialized_start=73
-  _globals['_SENDENCRYPTFILEREQUEST']._serialized_end=132
-  _globals['_ENCRYPTER']._serialized_start=134
-  _globals['_ENCRYPTER']._serialized_end=229
+  _globals['_ENCRYPTFILEREQUEST']._serialized_start=73
+  _globals['_ENCRYPTFILEREQUEST']._serialized_end=144
+  _globals['_SENDENCRYPTFILEREQUEST']._serialized_start=146
+  _globals['_SENDENCRYPTFILEREQUEST']._serialized_end=205
+  _globals['_SENDENCRYPTFILEPROGRESS']._serialized_start=207
+  _globals['_SENDENCRYPTFILEPROGRESS']._serialized_end=293
+  _globals['_ENCRYPTFILEHEADER']._serialized_start=295
+  _globals['_ENCRYPTFILEHEADER']._serialized_end=367
+  _globals['_ENCRYPTFILETRAILER']._serialized_start=369
+  _globals['_ENCRYPTFILETRAILER']._serialized_end=412
+  _globals['_ENCRYPTFILEFRAME']._serialized_start=415
+  _globals['_ENCRYPTFILEFRAME']._serialized_end=560
+  _globals['_ENCRYPTER']._serialized_start=563
+  _globals['_ENCRYPTER']._serialized_end=926
 # @@protoc_insertion_point(module_scope)
@@ -35,30 +35,78 @@ class EncrypterStub(object):
         Args:
             channel: A grpc.Channel.
         """
+        self.EncryptFile = channel.unary_unary(
+                '/ralvarezdev.Encrypter/EncryptFile',
+                request_serializer=ralvarezdev_dot_encrypter__pb2.EncryptFileRequest.SerializeToString,
+                response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                _registered_method=True)
         self.SendEncryptedFile = channel.stream_unary(
                 '/ralvarezdev.Encrypter/SendEncryptedFile',
                 request_serializer=ralvarezdev_dot_encrypter__pb2.SendEncryptFileRequest.SerializeToString,
                 response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
                 _registered_method=True)
+        self.SendEncryptedFileWithProgress = channel.stream_stream(
+                '/ralvarezdev.Encrypter/SendEncryptedFileWithProgress',
+                request_serializer=ralvarezdev_dot_encrypter__pb2.SendEncryptFileRequest.SerializeToString,
+                response_deserializer=ralvarezdev_dot_encrypter__pb2.SendEncryptFileProgress.FromString,
+                _registered_method=True)
+        self.SendEncryptedFileFrames = channel.stream_unary(
+                '/ralvarezdev.Encrypter/SendEncryptedFileFrames',
+                request_serializer=ralvarezdev_dot_encrypter__pb2.EncryptFileFrame.SerializeToString,
+                response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                _registered_method=True)
 
 
 class EncrypterServicer(object):
     """Missing associated documentation comment in .proto file."""
 
+    def EncryptFile(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def SendEncryptedFile(self, request_iterator, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def SendEncryptedFileWithProgress(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SendEncryptedFileFrames(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_EncrypterServicer_to_server(servicer, server):
     rpc_method_handlers = {
+            'EncryptFile': grpc.unary_unary_rpc_method_handler(
+                    servicer.EncryptFile,
+                    request_deserializer=ralvarezdev_dot_encrypter__pb2.EncryptFileRequest.FromString,
+                    response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            ),
             'SendEncryptedFile': grpc.stream_unary_rpc_method_handler(
                     servicer.SendEncryptedFile,
                     request_deserializer=ralvarezdev_dot_encrypter__pb2.SendEncryptFileRequest.FromString,
                     response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
             ),
+            'SendEncryptedFileWithProgress': grpc.stream_stream_rpc_method_handler(
+                    servicer.SendEncryptedFileWithProgress,
+                    request_deserializer=ralvarezdev_dot_encrypter__pb2.SendEncryptFileRequest.FromString,
+                    response_serializer=ralvarezdev_dot_encrypter__pb2.SendEncryptFileProgress.SerializeToString,
+            ),
+            'SendEncryptedFileFrames': grpc.stream_unary_rpc_method_handler(
+                    servicer.SendEncryptedFileFrames,
+                    request_deserializer=ralvarezdev_dot_encrypter__pb2.EncryptFileFrame.FromString,
+                    response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'ralvarezdev.Encrypter', rpc_method_handlers)
@@ -70,6 +118,33 @@ def add_EncrypterServicer_to_server(servicer, server):
 class Encrypter(object):
     """Missing associated documentation comment in .proto file."""
 
+    @staticmethod
+    def EncryptFile(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/ralvarezdev.Encrypter/EncryptFile',
+            ralvarezdev_dot_encrypter__pb2.EncryptFileRequest.SerializeToString,
+            google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def SendEncryptedFile(request_iterator,
             target,
@@ -96,3 +171,57 @@ class Encrypter(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def SendEncryptedFileWithProgress(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/ralvarezdev.Encrypter/SendEncryptedFileWithProgress',
+            ralvarezdev_dot_encrypter__pb2.SendEncryptFileRequest.SerializeToString,
+            ralvarezdev_dot_encrypter__pb2.SendEncryptFileProgress.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SendEncryptedFileFrames(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/ralvarezdev.Encrypter/SendEncryptedFileFrames',
+            ralvarezdev_dot_encrypter__pb2.EncryptFileFrame.SerializeToString,
+            google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)